@@ -1,8 +1,17 @@
 import os
 import re
 import json
+import time
+import queue
+import threading
 import requests
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    ThreadPoolExecutor, wait, FIRST_COMPLETED)
 import urllib.parse
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import session
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
@@ -66,12 +75,389 @@ class AuthenticationError(Exception):
     pass
 
 
+class ResponseCache:
+    """
+    Thread-safe LRU cache of API responses with per-entry age tracking.
+
+    Entries are evicted least-recently-used first once max_entries is
+    reached. Freshness is decided by the caller (see EENClient.cache_ttls),
+    which gets each entry's age back from get().
+
+    Every invalidate() bumps the cache's generation. A caller that reads
+    `generation` before fetching and passes it to set() never stores a
+    response that was fetched before an invalidation finished.
+
+    :param max_entries: Maximum number of cached responses.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._revalidating = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "revalidations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key):
+        """:return: (value, age_seconds), or None if the key is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            value, stored_at = entry
+            return value, time.monotonic() - stored_at
+
+    @property
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, generation=None):
+        """
+        :param generation: `generation` read before value was fetched; the
+                           value is dropped if an invalidation ran since.
+        :return: True if the value was stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+            return True
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def begin_revalidate(self, key):
+        """:return: True if the caller should refresh key (no one else is)."""
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            self.counters["revalidations"] += 1
+            return True
+
+    def end_revalidate(self, key):
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def invalidate(self, account_id=None, endpoint_prefix=None):
+        """
+        Drop matching entries; with no arguments, drop everything.
+
+        :param account_id: Only entries cached for this account.
+        :param endpoint_prefix: Only entries whose endpoint starts with this.
+        :return: The number of entries removed.
+        """
+        with self._lock:
+            # Also covers matching requests still in flight, whose keys
+            # are not in the cache yet.
+            self._generation += 1
+            doomed = [
+                key for key in self._entries
+                if (account_id is None or key[3] == account_id) and
+                (endpoint_prefix is None or key[1].startswith(endpoint_prefix))
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self.counters["invalidations"] += len(doomed)
+            return len(doomed)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = round(
+            (stats["hits"] + stats["stale_hits"]) / lookups, 3) \
+            if lookups else None
+        return stats
+
+
+class LiveEventStream:
+    """
+    Fans one server-sent-events subscription out to many listeners.
+
+    The API accepts a single connection per event subscription, so every
+    browser watching the same camera shares one stream. Each listener gets a
+    bounded queue (the oldest event is dropped when it is full), and recent
+    events are kept so a reconnecting listener can resume from its last ID.
+
+    :param history: Events kept for resuming listeners.
+    :param queue_size: Events buffered per listener.
+    """
+
+    def __init__(self, history=100, queue_size=100):
+        # Event IDs are "<epoch>-<seq>"; the epoch tells a resuming listener
+        # whether its ID came from this stream or an earlier one.
+        self.epoch = format(time.time_ns() // 1000000, 'x')
+        self.queue_size = queue_size
+        # The stream's own token store (see EENClient.live_events).
+        self.tokens = {}
+        self.subscription_id = None
+        self.sse_url = None
+        self.last_event_id = None
+        self.closed = False
+        self._seq = 0
+        self._history = deque(maxlen=history)
+        self._listeners = set()
+        self._idle_since = time.monotonic()
+        self._lock = threading.Lock()
+        self.counters = {
+            "connects": 0,
+            "received": 0,
+            "delivered": 0,
+            "dropped": 0,
+        }
+
+    def listen(self, last_event_id=None):
+        """
+        Register a listener.
+
+        :param last_event_id: The last event ID the listener saw; newer
+                              events still in the history are replayed.
+        :return: A queue of (event_id, event) tuples; None marks the end.
+        """
+        listener = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            seq = None
+            if last_event_id and last_event_id.startswith(f"{self.epoch}-"):
+                try:
+                    seq = int(last_event_id.split('-', 1)[1])
+                except ValueError:
+                    pass
+            if seq is not None:
+                for item_seq, item in self._history:
+                    if item_seq > seq:
+                        self.__offer(listener, item)
+            self._listeners.add(listener)
+            self._idle_since = None
+        return listener
+
+    def unlisten(self, listener):
+        with self._lock:
+            self._listeners.discard(listener)
+            if not self._listeners:
+                self._idle_since = time.monotonic()
+
+    def idle_for(self):
+        """:return: Seconds since the last listener left (0 while in use)."""
+        with self._lock:
+            if self._idle_since is None:
+                return 0
+            return time.monotonic() - self._idle_since
+
+    def publish(self, event):
+        with self._lock:
+            self._seq += 1
+            item = (f"{self.epoch}-{self._seq}", event)
+            self._history.append((self._seq, item))
+            self.counters["received"] += 1
+            for listener in self._listeners:
+                self.__offer(listener, item)
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            for listener in self._listeners:
+                self.__offer(listener, None)
+
+    def __offer(self, listener, item):
+        # Called with _lock held.
+        try:
+            listener.put_nowait(item)
+        except queue.Full:
+            try:
+                listener.get_nowait()
+            except queue.Empty:
+                pass
+            listener.put_nowait(item)
+            self.counters["dropped"] += 1
+        if item is not None:
+            self.counters["delivered"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["listeners"] = len(self._listeners)
+            stats["subscription_id"] = self.subscription_id
+        return stats
+
+
 class EENClient:
     auth_url = "https://auth.eagleeyenetworks.com/oauth2/authorize"
 
-    def __init__(self, client_id, client_secret):
+    # Pooled HTTP session
+    # One requests.Session per worker process, shared by every request thread,
+    # so TLS connections to the API host stay open between page renders.
+    pool_maxsize = int(os.getenv('EEN_HTTP_POOL_SIZE', '20'))
+    connect_retries = int(os.getenv('EEN_HTTP_CONNECT_RETRIES', '2'))
+    _http = None
+    _http_pid = None
+    _http_lock = threading.Lock()
+
+    # Timeouts
+    # (connect, read) seconds per endpoint family (first path segment), so a
+    # stuck upstream call can never pin a worker thread forever.
+    default_timeout = (
+        float(os.getenv('EEN_HTTP_CONNECT_TIMEOUT', '3.05')),
+        float(os.getenv('EEN_HTTP_READ_TIMEOUT', '15'))
+    )
+    timeouts = {
+        "/cameras": (3.05, 10),
+        "/feeds": (3.05, 10),
+        "/users": (3.05, 10),
+        "/events": (3.05, 20),
+        "/events:listFieldValues": (3.05, 20),
+        "/media": (3.05, 30),
+        "/eventSubscriptions": (3.05, 10),
+    }
+
+    # Hedged requests
+    # For idempotent GETs on these endpoint families a second, identical
+    # request is sent if the first has not answered within the family's p95
+    # latency; whichever response arrives first is used.
+    hedged_endpoints = ("/cameras", "/feeds")
+    hedge_min_samples = 20
+    hedge_min_delay = 0.05
+    _hedge_pool = None
+
+    # Concurrent calls (see gather) and the lock that keeps concurrent calls
+    # from refreshing the same user's token twice.
+    gather_max_workers = int(os.getenv('EEN_GATHER_WORKERS', '16'))
+    _gather_pool = None
+    _refresh_lock = threading.Lock()
+
+    # Token store
+    # API calls read the access token, refresh token and base URL from, and
+    # write refreshed tokens to, the Flask session on a request thread, or the
+    # dict a worker thread was handed (see gather). Worker threads never push
+    # a request context: popping one runs teardown_request and closes the
+    # request that is still being served.
+    token_keys = ('access_token', 'refresh_token', 'base_url', 'account_id')
+    _local = threading.local()
+
+    # Response cache
+    # GET responses for rarely-changing metadata, keyed by
+    # (base_url, endpoint, params, account). Per endpoint family:
+    # (fresh seconds, stale seconds). A fresh entry is served as is; a stale
+    # one is served immediately while a background call refreshes it.
+    cache_ttls = {
+        "/cameras": (300, 3600),
+        "/events:listFieldValues": (300, 3600),
+    }
+    cache = ResponseCache(
+        max_entries=int(os.getenv('EEN_CACHE_MAX_ENTRIES', '1024')))
+
+    # Live events
+    # One SSE connection per (base_url, account, camera, event types) in this
+    # process, shared by every browser watching that camera (see
+    # live_events). The connection is closed once no browser has listened
+    # for sse_linger seconds; the temporary subscription behind it is kept
+    # for reuse until the server reports it gone.
+    sse_read_timeout = float(os.getenv('EEN_SSE_READ_TIMEOUT', '90'))
+    sse_keepalive = 15
+    sse_linger = 30
+    sse_reconnect_delay = (1, 30)
+    _live_streams = {}
+    _subscriptions = {}
+    _live_lock = threading.Lock()
+
+    # Metrics, shared by every EENClient in the process.
+    _metrics_lock = threading.Lock()
+    _metrics = {
+        "requests": 0,
+        "in_flight": 0,
+        "in_flight_peak": 0,
+        "timeouts": 0,
+        "errors": 0,
+        "hedges_sent": 0,
+        "hedges_won": 0,
+    }
+    _latencies = {}
+
+    def __init__(self, client_id, client_secret, hedge=None):
         self.client_id = client_id
         self.client_secret = client_secret
+        if hedge is None:
+            hedge = os.getenv('EEN_HEDGE_REQUESTS', 'false').lower() == 'true'
+        self.hedge = hedge
+
+    @classmethod
+    def http_session(cls):
+        """
+        Return the pooled requests.Session for this process.
+
+        The session is created lazily and re-created after a fork, so gunicorn
+        workers forked from a preloaded app never share sockets.
+        """
+        pid = os.getpid()
+        if cls._http is None or cls._http_pid != pid:
+            with cls._http_lock:
+                if cls._http is None or cls._http_pid != pid:
+                    http = requests.Session()
+                    # The session is shared by every user of the app, so it
+                    # must never store a response cookie and replay it for
+                    # someone else.
+                    http.cookies.set_policy(
+                        DefaultCookiePolicy(allowed_domains=[]))
+                    # Only connection failures are retried: the request never
+                    # reached the server, so this is safe for POST as well.
+                    retries = Retry(
+                        total=cls.connect_retries,
+                        connect=cls.connect_retries,
+                        read=False,
+                        status=0,
+                        backoff_factor=0.2
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=10,
+                        pool_maxsize=cls.pool_maxsize,
+                        max_retries=retries
+                    )
+                    http.mount('https://', adapter)
+                    cls._http = http
+                    cls._http_pid = pid
+        return cls._http
+
+    @classmethod
+    def pool_stats(cls):
+        """
+        Connection reuse per host for this process's pooled session.
+
+        :return: {host: {"requests", "connections_opened",
+                  "connections_reused"}}
+        """
+        stats = {}
+        if cls._http is None or cls._http_pid != os.getpid():
+            return stats
+        pools = cls._http.get_adapter('https://').poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            host = stats.setdefault(
+                f"{pool.host}:{pool.port}",
+                {"requests": 0, "connections_opened": 0})
+            host["requests"] += pool.num_requests
+            host["connections_opened"] += pool.num_connections
+        for host in stats.values():
+            host["connections_reused"] = max(
+                0, host["requests"] - host["connections_opened"])
+        return stats
 
     # OAuth Authentication
     def auth_een(self, token, type="code"):
@@ -98,8 +484,9 @@ class EENClient:
             }
         else:
             raise Exception("Invalid auth type")
-        response = requests.post(
+        response = self.http_session().post(
             url,
+            timeout=self.default_timeout,
             auth=(
                 os.getenv('CLIENT_ID'),
                 os.getenv('CLIENT_SECRET')
@@ -109,6 +496,477 @@ class EENClient:
         )
         return response
 
+    @staticmethod
+    def endpoint_family(endpoint):
+        """
+        Group an endpoint by its first path segment for timeouts and metrics,
+        e.g. "/cameras/100d4c41" -> "/cameras".
+        """
+        return "/" + endpoint.lstrip("/").split("/", 1)[0]
+
+    @classmethod
+    def timeout_for(cls, endpoint):
+        return cls.timeouts.get(cls.endpoint_family(endpoint), cls.default_timeout)
+
+    @classmethod
+    def _record_latency(cls, family, seconds):
+        with cls._metrics_lock:
+            samples = cls._latencies.get(family)
+            if samples is None:
+                samples = cls._latencies[family] = deque(maxlen=200)
+            samples.append(seconds)
+
+    @classmethod
+    def _percentile(cls, family, q):
+        with cls._metrics_lock:
+            samples = sorted(cls._latencies.get(family, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q / 100.0 * len(samples)))]
+
+    @classmethod
+    def _count(cls, name, n=1):
+        with cls._metrics_lock:
+            cls._metrics[name] += n
+            if name == "in_flight":
+                cls._metrics["in_flight_peak"] = max(
+                    cls._metrics["in_flight_peak"], cls._metrics["in_flight"])
+
+    @classmethod
+    def metrics(cls):
+        """
+        Request metrics for this worker process: counters, in-flight gauge
+        (and its peak, which shows worker saturation), per-endpoint p50/p95
+        latency in ms, and connection pool reuse.
+        """
+        with cls._metrics_lock:
+            snapshot = dict(cls._metrics)
+            families = list(cls._latencies)
+        snapshot["latency_ms"] = {}
+        for family in families:
+            p50 = cls._percentile(family, 50)
+            p95 = cls._percentile(family, 95)
+            snapshot["latency_ms"][family] = {
+                "p50": round(p50 * 1000, 1),
+                "p95": round(p95 * 1000, 1),
+            }
+        snapshot["pools"] = cls.pool_stats()
+        snapshot["cache"] = cls.cache.stats()
+        with cls._live_lock:
+            streams = dict(cls._live_streams)
+        snapshot["live_events"] = {
+            key[2]: stream.stats() for key, stream in streams.items()
+        }
+        return snapshot
+
+    @classmethod
+    def _hedge_executor(cls):
+        if cls._hedge_pool is None:
+            with cls._http_lock:
+                if cls._hedge_pool is None:
+                    cls._hedge_pool = ThreadPoolExecutor(
+                        max_workers=cls.pool_maxsize,
+                        thread_name_prefix="een-hedge")
+        return cls._hedge_pool
+
+    @classmethod
+    def _gather_executor(cls):
+        if cls._gather_pool is None:
+            with cls._http_lock:
+                if cls._gather_pool is None:
+                    cls._gather_pool = ThreadPoolExecutor(
+                        max_workers=cls.gather_max_workers,
+                        thread_name_prefix="een-gather")
+        return cls._gather_pool
+
+    # Concurrent Calls
+    # Runs independent API calls in parallel, so a page waits for the
+    # slowest call instead of the sum of all of them.
+    def gather(self, *calls):
+        """
+        Run API calls concurrently and return their results in order.
+
+        The calls run on worker threads without a request context. They
+        share a copy of the session's tokens, and tokens refreshed by any of
+        them are written back to the session once every call has finished.
+
+            cameras, feeds = client.gather(
+                client.get_cameras,
+                lambda: client.get_feeds(type="main"))
+
+        :param calls: Zero-argument callables.
+        :return: A list with each call's return value.
+        :raises: The first call's exception (in call order), after every
+                 call has finished.
+        """
+        store = getattr(self._local, 'store', None)
+        if store is None:
+            # On the request thread: hand the workers a copy of the session.
+            tokens = {key: session.get(key) for key in self.token_keys}
+        else:
+            tokens = store
+
+        executor = self._gather_executor()
+        futures = [
+            executor.submit(self._run_with_tokens, tokens, call)
+            for call in calls
+        ]
+        wait(futures)
+        if store is None:
+            for key, value in tokens.items():
+                if session.get(key) != value:
+                    session[key] = value
+        return [future.result() for future in futures]
+
+    def _run_with_tokens(self, tokens, call):
+        """Run call on this thread with tokens as its token store."""
+        previous = getattr(self._local, 'store', None)
+        self._local.store = tokens
+        try:
+            return call()
+        finally:
+            self._local.store = previous
+
+    def _tokens(self):
+        """This thread's token store: a worker's dict, or the Flask session."""
+        store = getattr(self._local, 'store', None)
+        return session if store is None else store
+
+    # Cache Invalidation
+    # Drops cached responses, e.g. after a write that changes them.
+    def invalidate_cache(self, endpoint_prefix=None, account_id=None):
+        """
+        :param endpoint_prefix: Only endpoints starting with this,
+                                e.g. "/cameras".
+        :param account_id: Only this account (default: every account).
+        :return: The number of entries removed.
+        """
+        return self.cache.invalidate(
+            account_id=account_id, endpoint_prefix=endpoint_prefix)
+
+    # Account ID
+    # Cached responses are scoped to the logged-in account. The login route
+    # stores it in the session; older sessions look it up once.
+    def __account_id(self):
+        tokens = self._tokens()
+        account_id = tokens.get('account_id')
+        if account_id is None and tokens.get('access_token'):
+            account_id = json.loads(self.current_user()).get('accountId')
+            tokens['account_id'] = account_id
+        return account_id
+
+    # Background Revalidation
+    # Refreshes a stale cache entry without making the caller wait. The
+    # refresh runs after the response (and its session cookie) has gone out,
+    # so it uses a private copy of the access token and base URL and never
+    # refreshes tokens: on a 401 or any other error the stale entry is kept
+    # and the next request for it tries again. __api_call stores the new
+    # value unless the entry was invalidated while the request was out.
+    def __revalidate(self, cache_key, endpoint, params, headers):
+        if not self.cache.begin_revalidate(cache_key):
+            return
+
+        tokens = {
+            key: self._tokens().get(key)
+            for key in ('access_token', 'base_url', 'account_id')
+        }
+
+        def refresh():
+            try:
+                self.__api_call(
+                    endpoint, params=params, headers=dict(headers or {}),
+                    cache=False)
+            except Exception as e:
+                print(f"Cache revalidation failed for {endpoint}: {e}")
+            finally:
+                self.cache.end_revalidate(cache_key)
+
+        self._gather_executor().submit(self._run_with_tokens, tokens, refresh)
+
+    # Live Events
+    # Streams new events for a camera without polling /events. The first
+    # listener starts a background consumer of the camera's SSE subscription;
+    # later listeners share it.
+    def live_events(self, camera_id, event_types, last_event_id=None):
+        """
+        Listen for new events on a camera.
+
+            for event_id, event in client.live_events(camera_id, types):
+                if event is None:
+                    continue  # keep-alive
+                ...
+
+        :param camera_id: The camera (actor) to listen to.
+        :param event_types: Event types to deliver, e.g.
+                            ["een.personDetectionEvent.v1"].
+        :param last_event_id: Resume after this event ID (the browser's
+                              Last-Event-ID header).
+        :return: A generator of (event_id, event dict), yielding
+                 (None, None) every sse_keepalive seconds while idle. It ends
+                 if the upstream stream stops for good, e.g. when its access
+                 token has expired; the browser then reconnects with a fresh
+                 one.
+        """
+        tokens = self._tokens()
+        key = (
+            tokens.get('base_url'),
+            self.__account_id(),
+            camera_id,
+            tuple(sorted(event_types))
+        )
+        with self._live_lock:
+            stream = self._live_streams.get(key)
+            start = stream is None or stream.closed
+            if start:
+                stream = LiveEventStream()
+                stream.tokens = {
+                    'access_token': None,
+                    'base_url': key[0],
+                    'account_id': key[1]
+                }
+                self._live_streams[key] = stream
+            # The stream outlives this request, so it never refreshes tokens
+            # itself (that would rotate away this user's refresh token). It
+            # uses the newest access token any listener has brought.
+            stream.tokens['access_token'] = tokens.get('access_token')
+            listener = stream.listen(last_event_id)
+
+        if start:
+            threading.Thread(
+                target=self._run_with_tokens,
+                args=(stream.tokens, lambda: self.__consume_events(
+                    key, stream, camera_id, list(key[3]))),
+                name=f"een-sse-{camera_id}",
+                daemon=True
+            ).start()
+
+        def listen():
+            try:
+                while True:
+                    try:
+                        item = listener.get(timeout=self.sse_keepalive)
+                    except queue.Empty:
+                        yield None, None
+                        continue
+                    if item is None:
+                        return
+                    yield item
+            finally:
+                stream.unlisten(listener)
+
+        return listen()
+
+    # Consume Events
+    # Runs in a background thread, with the stream's token store and no
+    # request context, for as long as the stream has listeners. Reconnects
+    # with exponential backoff, resuming from the last event ID received.
+    def __consume_events(self, key, stream, camera_id, event_types):
+        delay = self.sse_reconnect_delay[0]
+        try:
+            while True:
+                # A listener arriving after this check gets the closing
+                # marker and reconnects to a new stream.
+                if stream.idle_for() > self.sse_linger:
+                    return
+                try:
+                    # None: the subscription expired. A new one is created
+                    # on the next pass, after the same backoff as an error.
+                    response = self.__open_event_stream(
+                        key, stream, camera_id, event_types)
+                    if response is not None:
+                        stream.counters["connects"] += 1
+                        delay = self.sse_reconnect_delay[0]
+                        with response:
+                            for event_id, data, retry in self.__parse_sse(
+                                    response):
+                                if retry is not None:
+                                    delay = retry
+                                if event_id is not None:
+                                    stream.last_event_id = event_id
+                                if data:
+                                    self.__publish_event(stream, data)
+                                if stream.idle_for() > self.sse_linger:
+                                    return
+                except AuthenticationError:
+                    print(f"Live events for {camera_id} stopped: "
+                          "access token rejected")
+                    return
+                except Exception as e:
+                    print(f"Live events for {camera_id} disconnected: {e}")
+
+                time.sleep(delay)
+                delay = min(delay * 2, self.sse_reconnect_delay[1])
+        finally:
+            with self._live_lock:
+                if self._live_streams.get(key) is stream:
+                    del self._live_streams[key]
+                stream.close()
+
+    # Publish Event
+    # Hands one SSE message to the stream's listeners; messages that are not
+    # JSON events are logged and skipped.
+    @staticmethod
+    def __publish_event(stream, data):
+        try:
+            event = json.loads(data)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            print(f"Ignoring SSE data: {data[:200]}")
+            return
+        stream.publish(event)
+
+    # Open Event Stream
+    # Connects to the camera's SSE subscription, creating the subscription
+    # first if this process has none (or it has expired).
+    def __open_event_stream(self, key, stream, camera_id, event_types):
+        """
+        :return: The streaming response, or None if the subscription is gone.
+        """
+        if stream.sse_url is None:
+            with self._live_lock:
+                known = self._subscriptions.get(key)
+            if known:
+                stream.subscription_id, stream.sse_url = known
+            else:
+                subscription = json.loads(self.create_event_subscription(
+                    [f"camera:{camera_id}"], event_types))
+                stream.subscription_id = subscription['id']
+                stream.sse_url = subscription['deliveryConfig']['sseUrl']
+                stream.last_event_id = None
+                with self._live_lock:
+                    self._subscriptions[key] = (
+                        stream.subscription_id, stream.sse_url)
+                print(f"Created event subscription {stream.subscription_id}")
+
+        for retry_count in range(2):
+            access_token = self._tokens().get('access_token')
+            headers = {
+                'Accept': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+                'Authorization': f"Bearer {access_token}"
+            }
+            if stream.last_event_id:
+                headers['Last-Event-ID'] = stream.last_event_id
+            response = self.__send(
+                'GET', "/eventSubscriptions", stream.sse_url,
+                headers=headers, stream=True,
+                timeout=(self.timeout_for("/eventSubscriptions")[0],
+                         self.sse_read_timeout))
+            if response.ok:
+                return response
+            response.close()
+            if response.status_code == 401 and retry_count == 0:
+                # Retries only if a listener has since brought a newer
+                # access token; the stream has no refresh token to use.
+                with self._refresh_lock:
+                    self.__refresh_token(response)
+                continue
+            if response.status_code in (404, 410):
+                with self._live_lock:
+                    self._subscriptions.pop(key, None)
+                stream.subscription_id = stream.sse_url = None
+                return None
+            raise Exception(
+                f"{response.status_code} Response: {response.text}")
+        raise AuthenticationError
+
+    # Parse SSE
+    # Splits a text/event-stream response into events, following
+    # https://html.spec.whatwg.org/multipage/server-sent-events.html
+    @staticmethod
+    def __parse_sse(response):
+        """
+        :return: A generator of (event_id, data, retry_seconds). event_id
+                 and retry_seconds are None when the event did not set them.
+                 Comment lines (the server's keep-alives) yield
+                 (None, None, None), so a quiet stream still hands control
+                 back to the caller.
+        """
+        response.encoding = 'utf-8'
+        event_id, data, retry = None, [], None
+        # chunk_size=None yields data as it arrives instead of waiting for
+        # a full buffer.
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if not line:
+                if data or event_id is not None or retry is not None:
+                    yield event_id, "\n".join(data), retry
+                event_id, data, retry = None, [], None
+                continue
+            if line.startswith(':'):
+                yield None, None, None
+                continue
+            field, _, value = line.partition(':')
+            if value.startswith(' '):
+                value = value[1:]
+            if field == 'data':
+                data.append(value)
+            elif field == 'id' and '\0' not in value:
+                event_id = value
+            elif field == 'retry' and value.isdigit():
+                retry = int(value) / 1000
+
+    # Send Request
+    # Sends one HTTP request with the endpoint's timeout and records metrics.
+    def __send(self, method, endpoint, url, **kwargs):
+        family = self.endpoint_family(endpoint)
+        kwargs.setdefault('timeout', self.timeout_for(endpoint))
+        self._count("requests")
+        self._count("in_flight")
+        started = time.monotonic()
+        try:
+            response = self.http_session().request(method, url, **kwargs)
+        except requests.exceptions.Timeout:
+            self._count("timeouts")
+            raise
+        except requests.exceptions.RequestException:
+            self._count("errors")
+            raise
+        finally:
+            self._count("in_flight", -1)
+        self._record_latency(family, time.monotonic() - started)
+        return response
+
+    # Hedged Request
+    # Sends a GET and, if it has not answered within the endpoint's p95
+    # latency, an identical second GET. The first response to arrive wins.
+    def __hedged_get(self, endpoint, url, **kwargs):
+        family = self.endpoint_family(endpoint)
+        p95 = None
+        with self._metrics_lock:
+            enough = len(self._latencies.get(family, ())) >= \
+                self.hedge_min_samples
+        if enough:
+            p95 = self._percentile(family, 95)
+        if p95 is None:
+            return self.__send('GET', endpoint, url, **kwargs)
+
+        executor = self._hedge_executor()
+        primary = executor.submit(self.__send, 'GET', endpoint, url, **kwargs)
+        done, _ = wait([primary], timeout=max(p95, self.hedge_min_delay))
+        if done:
+            return primary.result()
+
+        self._count("hedges_sent")
+        hedge = executor.submit(self.__send, 'GET', endpoint, url, **kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    self._count("hedges_won")
+                # Close the slower response when it arrives, returning its
+                # connection to the pool.
+                for other in pending:
+                    other.add_done_callback(
+                        lambda f: f.exception() is None and f.result().close())
+                return future.result()
+        raise error
+
     # Handle Response
     # This function will handle the response from an API call
     # while also handling authentication errors.
@@ -125,41 +983,53 @@ class EENClient:
                 return response
             return response.text
         elif response.status_code == 401 and retry_count < max_retries:
-            # Refresh the access token
-            print("Auth failed. Refreshing Access Token.")
-            refresh_token = session.get('refresh_token')
-            if refresh_token:
-                refresh_response = self.auth_een(refresh_token, type="refresh")
-                if refresh_response.status_code == 200:
-                    # print(auth_response.text)
-                    auth_response = json.loads(refresh_response.text)
-
-                    # Store the tokens in the session
-                    session['access_token'] = auth_response['access_token']
-                    session['refresh_token'] = auth_response['refresh_token']
-                    session[
-                        'base_url'] = auth_response['httpsBaseUrl']['hostname']
-
-                    # Retry the original request
-                    retry_count += 1
-                    return original_request_func(
-                        endpoint,
-                        retry_count=retry_count,
-                        *args, **kwargs
-                    )
-                else:
-                    print("Refresh Failed: {code} {text}".format(
-                        code=refresh_response.status_code,
-                        text=refresh_response.text
-                    ))
-                    raise AuthenticationError
-            else:
-                print("No refresh token found")
-                raise AuthenticationError
+            with self._refresh_lock:
+                self.__refresh_token(response)
+
+            # Retry the original request
+            retry_count += 1
+            return original_request_func(
+                endpoint,
+                retry_count=retry_count,
+                *args, **kwargs
+            )
         else:
             raise Exception(
                 f"{response.status_code} Response: {response.text}")
 
+    # Refresh Token
+    # Refreshes the access token after a 401 and stores it in the session
+    # (or the calling worker's token store, see gather).
+    # Runs under _refresh_lock: if a concurrent call (see gather) has already
+    # refreshed the token, the failed call is just retried with the new one.
+    def __refresh_token(self, response):
+        tokens = self._tokens()
+        used = response.request.headers.get('Authorization')
+        if used != f"Bearer {tokens.get('access_token')}":
+            return
+
+        print("Auth failed. Refreshing Access Token.")
+        refresh_token = tokens.get('refresh_token')
+        if refresh_token:
+            refresh_response = self.auth_een(refresh_token, type="refresh")
+            if refresh_response.status_code == 200:
+                # print(auth_response.text)
+                auth_response = json.loads(refresh_response.text)
+
+                # Store the tokens in the session (or the worker's store)
+                tokens['access_token'] = auth_response['access_token']
+                tokens['refresh_token'] = auth_response['refresh_token']
+                tokens['base_url'] = auth_response['httpsBaseUrl']['hostname']
+            else:
+                print("Refresh Failed: {code} {text}".format(
+                    code=refresh_response.status_code,
+                    text=refresh_response.text
+                ))
+                raise AuthenticationError
+        else:
+            print("No refresh token found")
+            raise AuthenticationError
+
     # API Call
     # This function will make an API call to the Eagle Eye Networks API
     def __api_call(
@@ -170,11 +1040,40 @@ class EENClient:
             data=None,
             headers=None,
             retry_count=0,
-            stream=False):
+            stream=False,
+            cache=True):
         # print(f"Making API call to {endpoint}")
         # print(f"Params: {params}")
-        access_token = session.get('access_token')
-        base_url = session.get('base_url')
+        access_token = self._tokens().get('access_token')
+        base_url = self._tokens().get('base_url')
+
+        cache_key = None
+        generation = None
+        ttl = self.cache_ttls.get(self.endpoint_family(endpoint))
+        account_id = None
+        if ttl and method == 'GET' and not stream and retry_count == 0:
+            account_id = self.__account_id()
+        if account_id is not None:
+            cache_key = (
+                base_url,
+                endpoint,
+                tuple(sorted((params or {}).items())),
+                account_id
+            )
+            cached = self.cache.get(cache_key) if cache else None
+            if cached is not None:
+                value, age = cached
+                fresh, stale = ttl
+                if age <= fresh:
+                    self.cache.count("hits")
+                    return value
+                if age <= fresh + stale:
+                    self.cache.count("stale_hits")
+                    self.__revalidate(cache_key, endpoint, params, headers)
+                    return value
+            if cache:
+                self.cache.count("misses")
+            generation = self.cache.generation
 
         url = f"https://{base_url}/api/v3.0{endpoint}"
         if params:
@@ -188,17 +1087,23 @@ class EENClient:
 
         if method == 'GET':
             try:
-                response = requests.get(url, headers=headers, stream=stream)
+                if self.hedge and not stream and \
+                        self.endpoint_family(endpoint) in self.hedged_endpoints:
+                    response = self.__hedged_get(
+                        endpoint, url, headers=headers)
+                else:
+                    response = self.__send(
+                        'GET', endpoint, url, headers=headers, stream=stream)
             except Exception as e:
                 print(f"Failed to make request: {e}")
                 raise e
         elif method == 'POST':
             print(f"Payload: {data}")
 
-            response = requests.post(
-                url, headers=headers, data=json.dumps(data))
+            response = self.__send(
+                'POST', endpoint, url, headers=headers, data=json.dumps(data))
 
-        return self.__handle_response(
+        result = self.__handle_response(
             response,
             self.__api_call,
             endpoint,
@@ -209,6 +1114,9 @@ class EENClient:
             retry_count=retry_count,
             stream=stream
         )
+        if cache_key is not None:
+            self.cache.set(cache_key, result, generation=generation)
+        return result
 
     # Get the current user
     # For more info see:
@@ -282,8 +1190,12 @@ class EENClient:
         }
         print(f"Data type: {data['type']}")
 
-        return self.__api_call(
+        response = self.__api_call(
             endpoint, headers=headers, data=data, method='POST')
+        # A new event can add event types to the actor's field values.
+        self.invalidate_cache(
+            "/events:listFieldValues", account_id=self.__account_id())
+        return response
 
     # Retrieve a recorded image
     # For more info see:
@@ -299,7 +1211,8 @@ class EENClient:
             "timestamp__gte": timestamp
         }
         if construct_url:
-            url = f"https://{session.get('base_url')}/api/v3.0{endpoint}"
+            base_url = self._tokens().get('base_url')
+            url = f"https://{base_url}/api/v3.0{endpoint}"
             url += f"?{urllib.parse.urlencode(params)}"
             return url
         return self.__api_call(endpoint, params=params, stream=True)
@@ -346,7 +1259,11 @@ class EENClient:
     # Get a list of cameras
     # For more info see:
     # https://developer.eagleeyenetworks.com/reference/listcameras
-    def get_cameras(self, camera_id=None):
+    def get_cameras(self, camera_id=None, cache=True):
+        """
+        :param cache: False to always ask the API, e.g. to check that this
+                      user may still see the camera.
+        """
         endpoint = "/cameras"
 
         if camera_id:
@@ -358,7 +1275,8 @@ class EENClient:
         }
         return self.__api_call(
             endpoint,
-            headers=headers
+            headers=headers,
+            cache=cache
         )
 
     # Get a list of feeds
@@ -375,3 +1293,30 @@ class EENClient:
         if device_id:
             params['deviceId'] = device_id
         return self.__api_call(endpoint, params=params)
+
+    # Create an event subscription
+    # Creates a temporary subscription delivered as server-sent events.
+    # For more info see:
+    # https://developer.eagleeyenetworks.com/reference/createeventsubscription
+    def create_event_subscription(self, actor_ids, event_types):
+        """
+        :param actor_ids: Actors to subscribe to, e.g. ["camera:100d4c41"].
+        :param event_types: Event types to deliver.
+        :return: The subscription, including deliveryConfig.sseUrl.
+        """
+        endpoint = "/eventSubscriptions"
+        headers = {
+            "accept": "application/json",
+            "content-type": "application/json"
+        }
+        data = {
+            "deliveryConfig": {
+                "type": "serverSentEvents.v1"
+            },
+            "filters": [{
+                "actors": actor_ids,
+                "types": [{"id": t} for t in event_types]
+            }]
+        }
+        return self.__api_call(
+            endpoint, headers=headers, data=data, method='POST')
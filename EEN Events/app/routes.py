@@ -7,6 +7,7 @@ from app.schemas import (
 import os
 import cv2
 import json
+import threading
 import urllib.parse
 from pydantic import ValidationError
 
@@ -21,7 +22,7 @@ from ultralytics import YOLO
 import numpy as np
 from flask import (
     request, render_template, session,
-    redirect, url_for, jsonify
+    redirect, url_for, jsonify, Response
 )
 from dotenv import load_dotenv
 
@@ -36,6 +37,12 @@ client = EENClient(
 # Load the YOLO model.
 model = YOLO('yolov8s.pt')
 
+# Event types not listed on the events page (too frequent to be useful).
+EXCLUDED_EVENT_TYPES = [
+    "een.motionDetectionEvent.v1",
+    "een.sceneLabelEvent.v1"
+]
+
 
 # Construct Detection Event
 def construct_detection_event(
@@ -126,6 +133,43 @@ def auth_required(f):
     return decorated_function
 
 
+# Request Metrics
+# Counts page requests being served by this worker process. When
+# in_flight approaches the number of worker threads, the worker is saturated.
+request_metrics = {"in_flight": 0, "in_flight_peak": 0, "served": 0}
+request_metrics_lock = threading.Lock()
+
+
+@app.before_request
+def count_request_start():
+    with request_metrics_lock:
+        request_metrics["in_flight"] += 1
+        request_metrics["in_flight_peak"] = max(
+            request_metrics["in_flight_peak"], request_metrics["in_flight"])
+
+
+@app.teardown_request
+def count_request_end(exc):
+    with request_metrics_lock:
+        request_metrics["in_flight"] -= 1
+        request_metrics["served"] += 1
+
+
+# Metrics
+# This route returns request, timeout, hedging and connection pool metrics
+# for the worker process that serves it.
+@app.route('/metrics')
+@auth_required
+def metrics():
+    with request_metrics_lock:
+        pages = dict(request_metrics)
+    return jsonify({
+        "pid": os.getpid(),
+        "pages": pages,
+        "api": EENClient.metrics()
+    })
+
+
 # Create Event
 # This route will create an event based on the provided JSON body.
 @app.route('/event', methods=['POST'])
@@ -365,15 +409,15 @@ def events(camera_id):
         'base_url': session.get('base_url')
     }
     form = TimeSelectForm()
-    exclude = [
-        "een.motionDetectionEvent.v1",
-        "een.sceneLabelEvent.v1"
-    ]
 
-    # Retrieve the camera info and event types
-    camera = json.loads(client.get_cameras(camera_id))
-    event_types = json.loads(client.get_event_field_values(camera_id))['type']
-    for e in exclude:
+    # Retrieve the camera info and event types (independent, so in parallel)
+    camera_response, field_values_response = client.gather(
+        lambda: client.get_cameras(camera_id),
+        lambda: client.get_event_field_values(camera_id)
+    )
+    camera = json.loads(camera_response)
+    event_types = json.loads(field_values_response)['type']
+    for e in EXCLUDED_EVENT_TYPES:
         try:
             event_types.remove(e)
         except ValueError:
@@ -419,6 +463,11 @@ def events(camera_id):
         print(f"Failed to load events: {e}")
 
     try:
+        # New events are pushed to the newest page while it is open
+        live_url = None
+        if not page_token and not end:
+            live_url = url_for('live_events', camera_id=camera_id)
+
         context = {k: v for k, v in {
             'media': media,
             'camera': camera,
@@ -427,13 +476,81 @@ def events(camera_id):
             'start': start,
             'end': end,
             'next_page': next_page,
-            'prev_page': prev_page
+            'prev_page': prev_page,
+            'live_url': live_url
         }.items() if v is not None}
         return render_template('events.html', **context)
     except Exception as e:
         print(f"Failed to render events: {e}")
 
 
+# Live Events
+# Streams new events for a camera to the browser as server-sent events.
+# Every browser watching the camera shares one upstream event subscription,
+# so open pages add no polling load on the API.
+@app.route('/events/<camera_id>/live')
+@auth_required
+def live_events(camera_id):
+    # Asked with this user's own token on every connect, never from the
+    # cache: the shared stream must not be joined on another user's cached
+    # answer. Being uncached, it also refreshes an expired access token (saved
+    # in this response's session cookie) before the stream adopts it.
+    try:
+        client.get_cameras(camera_id, cache=False)
+    except AuthenticationError:
+        raise
+    except Exception as e:
+        print(f"Live events refused for {camera_id}: {e}")
+        # Any status but 200 or 204 stops the browser's EventSource
+        return Response(status=403)
+    response = client.get_event_field_values(camera_id)
+    event_types = [
+        t for t in json.loads(response)['type']
+        if t not in EXCLUDED_EVENT_TYPES
+    ]
+    if not event_types:
+        # 204 tells the browser's EventSource not to reconnect
+        return Response(status=204)
+
+    listener = client.live_events(
+        camera_id,
+        event_types,
+        last_event_id=request.headers.get('Last-Event-ID')
+    )
+    placeholder = url_for('static', filename='assets/no_image.svg')
+
+    def stream():
+        for event_id, event in listener:
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            # Skip anything that is not a typed event, e.g. a status message
+            event_type = event.get('type') or ''
+            if '.' not in event_type:
+                continue
+            image = next((
+                d.get('httpsUrl') for d in event.get('data', [])
+                if d.get('type') == "een.fullFrameImageUrl.v1"
+            ), None)
+            message = {
+                'id': event.get('id'),
+                'type': camel_to_title(event_type.split('.')[1]),
+                'startTimestamp': event.get('startTimestamp'),
+                'httpsUrl': image,
+                'placeholderUrl': placeholder
+            }
+            yield f"id: {event_id}\ndata: {json.dumps(message)}\n\n"
+
+    return Response(
+        stream(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 # Live View
 # This page will display high res live view of a selected camera.
 @app.route('/view/<camera_id>')
@@ -488,8 +605,13 @@ def index():
 
     print('Pulling Camera List')
     try:
-        cam_response = json.loads(client.get_cameras())
-        feed_response = json.loads(client.get_feeds())
+        # The camera list and the feeds are independent; fetch both at once
+        cam_text, feed_text = client.gather(
+            client.get_cameras,
+            client.get_feeds
+        )
+        cam_response = json.loads(cam_text)
+        feed_response = json.loads(feed_text)
         cam_results = cam_response['results']
         feed_results = feed_response['results']
     except AuthenticationError:
@@ -538,6 +660,13 @@ def login():
             session['base_url'] = auth_response['httpsBaseUrl']['hostname']
             session.permanent = True
 
+            # Cached API responses are scoped to the account
+            try:
+                user = json.loads(client.current_user())
+                session['account_id'] = user.get('accountId')
+            except Exception as e:
+                print(f"Failed to get current user: {e}")
+
             return redirect(url_for('index'))
         else:
             print("Code Auth failed. {status_code} Response: {text}".format(
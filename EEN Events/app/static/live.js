@@ -0,0 +1,33 @@
+// Subscribes to an events page's live stream (/events/<camera_id>/live)
+// and adds each new event to the top of the result grid.
+function subscribeLiveEvents(url, gridId, authToken) {
+  const grid = document.getElementById(gridId);
+  const source = new EventSource(url);
+
+  source.onmessage = (message) => {
+    const event = JSON.parse(message.data);
+
+    // A reconnect can replay events that are already listed.
+    if (event.id && document.getElementById(event.id)) {
+      return;
+    }
+
+    const result = document.createElement('div');
+    result.className = 'result';
+    const title = document.createElement('h3');
+    title.textContent = event.type;
+    const timestamp = document.createElement('p');
+    timestamp.textContent = event.startTimestamp;
+    const image = document.createElement('img');
+    image.id = event.id;
+    image.src = event.placeholderUrl;
+    result.append(title, timestamp, image);
+    grid.prepend(result);
+
+    if (event.httpsUrl) {
+      displayProtectedImage(event.id, event.httpsUrl, authToken);
+    }
+  };
+
+  return source;
+}
@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+import types
+import urllib.parse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The routes load a YOLO model at import time; the metrics tests never run it.
+sys.modules.setdefault(
+    "ultralytics", types.SimpleNamespace(YOLO=lambda *args, **kwargs: None))
+
+from app import app, routes  # noqa: E402
+from app.een_client import EENClient  # noqa: E402
+
+CAMERAS = [{"id": f"cam{i}", "name": f"Camera {i}"} for i in range(6)]
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.ok = True
+        self.status_code = 200
+        self.text = json.dumps(body)
+
+
+class FakeHTTP:
+    """Answers the API calls the index page makes."""
+
+    def request(self, method, url, **kwargs):
+        path = urllib.parse.urlsplit(url).path
+        if path.endswith("/users/self"):
+            return FakeResponse({"accountId": "acc1"})
+        if path.endswith("/cameras"):
+            return FakeResponse({"results": CAMERAS})
+        if path.endswith("/feeds"):
+            return FakeResponse({"results": [
+                {"deviceId": c["id"], "multipartUrl": "https://x/mjpeg"}
+                for c in CAMERAS
+            ]})
+        raise AssertionError(f"unexpected request {method} {url}")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(
+        EENClient, "http_session", classmethod(lambda cls: FakeHTTP()))
+    EENClient.cache.invalidate()
+
+    app.config["TESTING"] = True
+    test_client = app.test_client()
+    with test_client.session_transaction() as session:
+        session["access_token"] = "token"
+        session["refresh_token"] = "refresh"
+        session["base_url"] = "api.example.com"
+    # session_transaction runs teardown_request too; start counting here.
+    with routes.request_metrics_lock:
+        routes.request_metrics.update(in_flight=0, in_flight_peak=0, served=0)
+    return test_client
+
+
+def test_index_leaves_no_request_in_flight(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert b"Camera 5" in response.data
+
+    # gather() fans the index's API calls out to worker threads; none of them
+    # may run the request teardown of the page being served.
+    assert routes.request_metrics["in_flight"] == 0
+    assert routes.request_metrics["served"] == 1
+
+    metrics = client.get("/metrics").get_json()
+    # The /metrics request itself is the only one in flight.
+    assert metrics["pages"]["in_flight"] == 1
+    assert metrics["pages"]["served"] == 1
+    assert routes.request_metrics["in_flight"] == 0
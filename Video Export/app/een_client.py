@@ -1,8 +1,12 @@
 import os
 import re
 import json
+import threading
 import requests
 import urllib.parse
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import session
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
@@ -72,10 +76,83 @@ class AuthenticationError(Exception):
 class EENClient:
     auth_url = "https://auth.eagleeyenetworks.com/oauth2/authorize"
 
+    # Pooled HTTP session
+    # One requests.Session per worker process, shared by every request thread,
+    # so TLS connections to the API host stay open between page renders.
+    pool_maxsize = int(os.getenv('EEN_HTTP_POOL_SIZE', '20'))
+    connect_retries = int(os.getenv('EEN_HTTP_CONNECT_RETRIES', '2'))
+    _http = None
+    _http_pid = None
+    _http_lock = threading.Lock()
+
     def __init__(self, client_id, client_secret):
         self.client_id = client_id
         self.client_secret = client_secret
 
+    @classmethod
+    def http_session(cls):
+        """
+        Return the pooled requests.Session for this process.
+
+        The session is created lazily and re-created after a fork, so gunicorn
+        workers forked from a preloaded app never share sockets.
+        """
+        pid = os.getpid()
+        if cls._http is None or cls._http_pid != pid:
+            with cls._http_lock:
+                if cls._http is None or cls._http_pid != pid:
+                    http = requests.Session()
+                    # The session is shared by every user of the app, so it
+                    # must never store a response cookie and replay it for
+                    # someone else.
+                    http.cookies.set_policy(
+                        DefaultCookiePolicy(allowed_domains=[]))
+                    # Only connection failures are retried: the request never
+                    # reached the server, so this is safe for POST as well.
+                    retries = Retry(
+                        total=cls.connect_retries,
+                        connect=cls.connect_retries,
+                        read=False,
+                        status=0,
+                        backoff_factor=0.2
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=10,
+                        pool_maxsize=cls.pool_maxsize,
+                        max_retries=retries
+                    )
+                    http.mount('https://', adapter)
+                    cls._http = http
+                    cls._http_pid = pid
+        return cls._http
+
+    @classmethod
+    def pool_stats(cls):
+        """
+        Connection reuse per host for this process's pooled session.
+
+        :return: {host: {"requests", "connections_opened",
+                  "connections_reused"}}
+        """
+        stats = {}
+        if cls._http is None or cls._http_pid != os.getpid():
+            return stats
+        pools = cls._http.get_adapter('https://').poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            host = stats.setdefault(
+                f"{pool.host}:{pool.port}",
+                {"requests": 0, "connections_opened": 0})
+            host["requests"] += pool.num_requests
+            host["connections_opened"] += pool.num_connections
+        for host in stats.values():
+            host["connections_reused"] = max(
+                0, host["requests"] - host["connections_opened"])
+        return stats
+
     # OAuth Authentication
     def auth_een(self, token, type="code"):
         url = "https://auth.eagleeyenetworks.com/oauth2/token"
@@ -101,7 +178,7 @@ class EENClient:
             }
         else:
             raise Exception("Invalid auth type")
-        response = requests.post(
+        response = self.http_session().post(
             url,
             auth=(
                 os.getenv('CLIENT_ID'),
@@ -194,14 +271,15 @@ class EENClient:
 
         if method == 'GET':
             try:
-                response = requests.get(url, headers=headers, stream=stream)
+                response = self.http_session().get(
+                    url, headers=headers, stream=stream)
             except Exception as e:
                 logging.error(f"Failed to make request: {e}")
                 raise e
         elif method == 'POST':
             logging.info(f"Payload: {json.dumps(data)}")
 
-            response = requests.post(
+            response = self.http_session().post(
                 url, headers=headers, data=json.dumps(data))
 
         return self.__handle_response(
@@ -3,34 +3,56 @@ Minimal Eagle Eye Networks API v3 client.
 Handles base-URL discovery and authenticated requests.
 """
 import json
+import os
+import socket
+import threading
+import time
+import urllib.error
 import urllib.parse
-import urllib.request
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 import auth
 import config
+import http_pool
 
 
 # Base URL is account-specific and must be resolved before making API calls.
+# It is cached in memory and persisted to config.BASE_URL_FILE so later runs skip
+# the /clientSettings round trip until the entry is older than config.BASE_URL_TTL.
 _base_url: str | None = None
 
 
 def _get_json(url: str, headers: dict, params: dict | None = None) -> dict:
     if params:
         url = f"{url}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers=headers, method="GET")
-    with urllib.request.urlopen(req) as resp:
-        return json.loads(resp.read().decode())
+    return json.loads(http_pool.request("GET", url, headers=headers).decode())
 
 
-def _get_base_url(access_token: str) -> str:
-    """
-    Fetch the account-specific base URL from the client settings endpoint.
-    Eagle Eye's base URL looks like https://api.c000.eagleeyenetworks.com/api/v3.0
-    """
+def _load_cached_base_url() -> str | None:
+    """Return the persisted base URL if present and younger than BASE_URL_TTL."""
+    try:
+        with open(config.BASE_URL_FILE) as f:
+            cached = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if time.time() - cached.get("resolved_at", 0) > config.BASE_URL_TTL:
+        return None
+    return cached.get("base_url")
+
+
+def invalidate_base_url() -> None:
+    """Forget the cached base URL, both in memory and on disk."""
     global _base_url
-    if _base_url:
-        return _base_url
+    _base_url = None
+    try:
+        os.remove(config.BASE_URL_FILE)
+    except FileNotFoundError:
+        pass
 
+
+def _resolve_base_url(access_token: str) -> str:
+    """Ask /clientSettings for the account's base URL, bypassing every cache."""
     data = _get_json(
         "https://api.eagleeyenetworks.com/api/v3.0/clientSettings",
         headers={
@@ -41,8 +63,47 @@ def _get_base_url(access_token: str) -> str:
     https_base = data.get("httpsBaseUrl", {})
     hostname = https_base.get("hostname", "api.eagleeyenetworks.com")
     port = https_base.get("port", 443)
-    _base_url = f"https://{hostname}:{port}/api/v3.0"
-    return _base_url
+    return f"https://{hostname}:{port}/api/v3.0"
+
+
+def _store_base_url(base_url: str) -> str:
+    global _base_url
+    _base_url = base_url
+    auth.write_json_atomic(config.BASE_URL_FILE, {"base_url": base_url, "resolved_at": time.time()})
+    return base_url
+
+
+def _get_base_url(access_token: str) -> str:
+    """
+    Fetch the account-specific base URL from the client settings endpoint.
+    Eagle Eye's base URL looks like https://api.c000.eagleeyenetworks.com/api/v3.0
+    """
+    global _base_url
+    if _base_url:
+        return _base_url
+
+    _base_url = _load_cached_base_url()
+    if _base_url:
+        return _base_url
+
+    return _store_base_url(_resolve_base_url(access_token))
+
+
+def _is_stale_base_url_error(error: urllib.error.URLError) -> bool:
+    """True for failures that may mean the cached base URL is wrong: 401, 404 or DNS failure."""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in (401, 404)
+    return isinstance(error.reason, socket.gaierror)
+
+
+# RTSP feed URLs (without token) keyed by (camera_id, stream_type, include).
+# Only valid for the access token they were fetched with; cleared when it rotates.
+_feed_cache: dict[tuple[str, str, str], str] = {}
+_feed_cache_token: str | None = None
+_feed_cache_lock = threading.Lock()
+
+# Cameras per /feeds?deviceId__in= request; keeps the query string a sane length.
+_FEEDS_BATCH_SIZE = 50
 
 
 def get_live_stream(camera_id: str | None = None, stream_type: str = "main", local: bool = False) -> str:
@@ -61,34 +122,176 @@ def get_live_stream(camera_id: str | None = None, stream_type: str = "main", loc
     if not device_id:
         raise ValueError("No camera ID provided. Set EEN_CAMERA_ID in .env or pass camera_id.")
 
-    include = "localRtspUrl" if local else "rtspUrl"
-    result = get("/feeds", params={"deviceId": device_id, "type": stream_type, "include": include})
-    feeds = result.get("results", [])
-    if not feeds:
-        raise RuntimeError(f"No feed returned for camera {device_id}.")
+    urls = get_live_streams([device_id], stream_type=stream_type, local=local)
+    if device_id not in urls:
+        include = "localRtspUrl" if local else "rtspUrl"
+        raise RuntimeError(f"No feed with '{include}' returned for camera {device_id}.")
+    return urls[device_id]
+
+
+def _fetch_feeds(device_ids: list[str], stream_type: str, include: str) -> dict[str, str]:
+    params = {"deviceId__in": ",".join(device_ids), "type": stream_type, "include": include}
+    return {
+        feed["deviceId"]: feed[include]
+        for feed in iter_pages("/feeds", params=params)
+        if feed.get(include) and feed.get("deviceId")
+    }
+
 
+def get_live_streams(
+    camera_ids: list[str], stream_type: str = "main", local: bool = False
+) -> dict[str, str]:
+    """
+    Resolve RTSP URLs for many cameras at once.
+
+    Feeds are requested in batches with deviceId__in (batches run concurrently)
+    and cached until the access token rotates, so repeated calls are free.
+
+    Args:
+        camera_ids:  Camera device IDs.
+        stream_type: "main" (full resolution) or "preview" (low quality).
+        local:       If True, request local bridge RTSP URLs instead of cloud URLs.
+
+    Returns:
+        {camera_id: RTSP URL with the access token appended}. Cameras that
+        returned no feed are left out.
+    """
+    global _feed_cache_token
+    include = "localRtspUrl" if local else "rtspUrl"
     access_token = auth.get_valid_access_token()
-    rtsp_url = feeds[0].get(include)
-    if not rtsp_url:
-        raise RuntimeError(f"Response did not contain '{include}' for camera {device_id}.")
 
-    return f"{rtsp_url}&access_token={access_token}"
+    with _feed_cache_lock:
+        if _feed_cache_token != access_token:
+            _feed_cache.clear()
+            _feed_cache_token = access_token
+        urls = {cid: _feed_cache[(cid, stream_type, include)]
+                for cid in camera_ids if (cid, stream_type, include) in _feed_cache}
+
+    missing = [cid for cid in dict.fromkeys(camera_ids) if cid not in urls]
+    batches = [missing[i:i + _FEEDS_BATCH_SIZE] for i in range(0, len(missing), _FEEDS_BATCH_SIZE)]
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(len(batches), 8), thread_name_prefix="een-feeds") as executor:
+            for fetched in executor.map(lambda batch: _fetch_feeds(batch, stream_type, include), batches):
+                urls.update(fetched)
+        with _feed_cache_lock:
+            if _feed_cache_token == access_token:
+                for cid in missing:
+                    if cid in urls:
+                        _feed_cache[(cid, stream_type, include)] = urls[cid]
+
+    return {cid: with_access_token(urls[cid], access_token) for cid in camera_ids if cid in urls}
+
+
+def get_recorded_clips(
+    camera_id: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    stream_type: str = "main",
+) -> list[dict]:
+    """
+    List recorded video clips for a camera from /media, following pagination.
+
+    Args:
+        camera_id:   Camera device ID. Defaults to CAMERA_ID from config.
+        start:       ISO 8601 timestamp; clips starting at or after it.
+        end:         Optional ISO 8601 timestamp; clips ending at or before it.
+        stream_type: "main" (full resolution) or "preview" (low quality).
+
+    Returns:
+        /media results with startTimestamp, endTimestamp, rtspUrl and mp4Url.
+        Pass them to frames_gst.clips_from_media for decoding.
+    """
+    device_id = camera_id or config.CAMERA_ID
+    if not device_id:
+        raise ValueError("No camera ID provided. Set EEN_CAMERA_ID in .env or pass camera_id.")
+    if not start:
+        raise ValueError("start is required, e.g. 2024-01-31T00:00:00.000+00:00.")
+
+    params = {
+        "deviceId": device_id,
+        "type": stream_type,
+        "mediaType": "video",
+        "startTimestamp__gte": start,
+        "include": "rtspUrl,mp4Url",
+        "pageSize": 100,
+    }
+    if end:
+        params["endTimestamp__lte"] = end
+    return list(iter_pages("/media", params=params, prefetch=True))
+
+
+def with_access_token(rtsp_url: str, access_token: str) -> str:
+    """
+    Return rtsp_url with its access_token query parameter set to access_token.
+    Use with auth.subscribe() to re-key a stream URL after a token refresh.
+    """
+    base, _, query = rtsp_url.partition("?")
+    # Keep the other parameters byte-for-byte; only the token is swapped.
+    params = [p for p in query.split("&") if p and not p.startswith("access_token=")]
+    params.append(f"access_token={access_token}")
+    return f"{base}?{'&'.join(params)}"
 
 
 def get(endpoint: str, params: dict | None = None) -> dict:
     """
     Perform a GET request against the EEN API v3.
     Automatically resolves the base URL and handles token refresh.
+
+    On a 401, 404 or DNS failure the base URL is re-resolved. Only if it
+    changed is the cached entry replaced and the request retried once; a 404
+    from the right host (e.g. an unknown camera ID) leaves the cache alone.
     """
     access_token = auth.get_valid_access_token()
     base_url = _get_base_url(access_token)
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/json",
+    }
 
-    url = f"{base_url}{endpoint}"
-    return _get_json(
-        url,
-        headers={
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        },
-        params=params,
-    )
+    try:
+        return _get_json(f"{base_url}{endpoint}", headers=headers, params=params)
+    except urllib.error.URLError as e:
+        if not _is_stale_base_url_error(e):
+            raise
+        fresh_base_url = _resolve_base_url(access_token)
+        if fresh_base_url == base_url:
+            raise
+        _store_base_url(fresh_base_url)
+
+    return _get_json(f"{fresh_base_url}{endpoint}", headers=headers, params=params)
+
+
+def iter_pages(endpoint: str, params: dict | None = None, prefetch: bool = False) -> Iterator[dict]:
+    """
+    Yield items from a paginated list endpoint (e.g. /cameras), following nextPageToken.
+
+    Pages are fetched lazily, so only one page (two with prefetch) is held in memory.
+
+    Args:
+        endpoint: API path, e.g. "/cameras".
+        params:   Query parameters sent with every page (pageSize, include, filters...).
+        prefetch: If True, request the next page on a background thread while the
+                  caller is still consuming the current one.
+    """
+    params = dict(params or {})
+
+    if not prefetch:
+        while True:
+            page = get(endpoint, params=params)
+            yield from page.get("results", [])
+            next_token = page.get("nextPageToken")
+            if not next_token:
+                return
+            params["pageToken"] = next_token
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="een-prefetch") as executor:
+        future = executor.submit(get, endpoint, dict(params))
+        while True:
+            page = future.result()
+            next_token = page.get("nextPageToken")
+            if next_token:
+                params["pageToken"] = next_token
+                future = executor.submit(get, endpoint, dict(params))
+            yield from page.get("results", [])
+            if not next_token:
+                return
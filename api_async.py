@@ -0,0 +1,78 @@
+"""
+asyncio variant of the EEN API v3 client in api.py.
+
+Requests run on a bounded worker pool over the shared keep-alive connections
+from http_pool.py, so hundreds of calls can be awaited together:
+
+    async with AsyncClient(concurrency=32) as client:
+        cameras = await asyncio.gather(*(client.get(f"/cameras/{cid}") for cid in ids))
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import api
+import auth
+import http_pool
+
+
+class AsyncClient:
+    """
+    Async wrapper with the same surface as api.py: get, get_live_stream and
+    base-URL discovery. Token refresh is handled transparently by auth.py.
+
+    Args:
+        concurrency: Maximum number of requests in flight at once. The shared
+                     connection pool is grown to keep this many connections alive.
+    """
+
+    def __init__(self, concurrency: int = 16):
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="een-async")
+        http_pool.ensure_capacity(concurrency)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def get_base_url(self) -> str:
+        """Resolve (or return the cached) account base URL."""
+        access_token = await self._run(auth.get_valid_access_token)
+        return await self._run(api._get_base_url, access_token)
+
+    async def get(self, endpoint: str, params: dict | None = None) -> dict:
+        """Async equivalent of api.get."""
+        return await self._run(api.get, endpoint, params)
+
+    async def get_live_stream(
+        self, camera_id: str | None = None, stream_type: str = "main", local: bool = False
+    ) -> str:
+        """Async equivalent of api.get_live_stream."""
+        return await self._run(api.get_live_stream, camera_id, stream_type, local)
+
+    async def get_live_streams(
+        self, camera_ids: list[str], stream_type: str = "main", local: bool = False
+    ) -> dict[str, str]:
+        """Async equivalent of api.get_live_streams."""
+        return await self._run(api.get_live_streams, camera_ids, stream_type, local)
+
+    async def get_many(self, endpoints: list[str], params: dict | None = None) -> list[dict | BaseException]:
+        """
+        GET every endpoint concurrently. Results are returned in order;
+        failed requests appear as the exception instead of aborting the batch.
+        """
+        return await asyncio.gather(*(self.get(e, params) for e in endpoints), return_exceptions=True)
+
+    def close(self) -> None:
+        """Shut down the worker pool. Pooled connections stay open for reuse."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
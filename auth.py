@@ -1,11 +1,14 @@
 import base64
 import json
+import os
+import tempfile
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from typing import Callable
 
 import config
+import http_pool
 
 
 def build_authorization_url() -> str:
@@ -28,9 +31,7 @@ def _basic_auth_header() -> str:
 
 def _post(url: str, headers: dict, data: dict) -> dict:
     body = urllib.parse.urlencode(data).encode()
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-    with urllib.request.urlopen(req) as resp:
-        return json.loads(resp.read().decode())
+    return json.loads(http_pool.request("POST", url, headers=headers, body=body).decode())
 
 
 def exchange_code_for_tokens(code: str) -> dict:
@@ -67,20 +68,65 @@ def refresh_access_token(refresh_token: str) -> dict:
     return tokens
 
 
+# Process-wide token cache. Keyed by the token file's mtime so that edits made
+# by another process (e.g. `python main.py refresh`) are picked up on the next call.
+_token_lock = threading.Lock()
+_cached_tokens: dict | None = None
+_cached_mtime: int | None = None
+
+
+def write_json_atomic(path: str, data: dict) -> None:
+    """Write JSON to path via a temp file + rename so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _token_file_mtime() -> int | None:
+    try:
+        return os.stat(config.TOKEN_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _read_cached_tokens() -> dict | None:
+    """Return the cached tokens, re-reading the file only if its mtime changed."""
+    global _cached_tokens, _cached_mtime
+    mtime = _token_file_mtime()
+    if mtime is None:
+        _cached_tokens, _cached_mtime = None, None
+        return None
+    if mtime != _cached_mtime:
+        try:
+            with open(config.TOKEN_FILE) as f:
+                tokens = json.load(f)
+        except FileNotFoundError:
+            return None
+        _cached_tokens, _cached_mtime = tokens, mtime
+    return _cached_tokens
+
+
 def save_tokens(tokens: dict) -> None:
-    """Persist tokens to a local JSON file."""
-    with open(config.TOKEN_FILE, "w") as f:
-        json.dump(tokens, f, indent=2)
+    """Persist tokens to a local JSON file (atomically) and update the in-memory cache."""
+    global _cached_tokens, _cached_mtime
+    write_json_atomic(config.TOKEN_FILE, tokens)
+    _cached_tokens, _cached_mtime = tokens, _token_file_mtime()
     print(f"Tokens saved to {config.TOKEN_FILE}")
 
 
 def load_tokens() -> dict | None:
     """Load tokens from the local JSON file. Returns None if not found."""
-    try:
-        with open(config.TOKEN_FILE) as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return None
+    tokens = _read_cached_tokens()
+    return dict(tokens) if tokens is not None else None
 
 
 def is_access_token_expired(tokens: dict, buffer_seconds: int = 300) -> bool:
@@ -94,14 +140,126 @@ def get_valid_access_token() -> str:
     """
     Return a valid access token, refreshing automatically if needed.
     Raises RuntimeError if no tokens are stored.
+
+    Tokens are served from memory; the file is only re-read when its mtime changes.
+    When the token is near expiry, a lock ensures that concurrent callers trigger
+    exactly one refresh — the others wait and pick up the new token.
     """
-    tokens = load_tokens()
+    tokens = _read_cached_tokens()
     if tokens is None:
         raise RuntimeError("No tokens found. Run the OAuth flow first (python main.py login).")
+    if not is_access_token_expired(tokens):
+        return tokens["access_token"]
 
-    if is_access_token_expired(tokens):
-        print("Access token expired — refreshing...")
-        tokens = refresh_access_token(tokens["refresh_token"])
-        save_tokens(tokens)
+    with _token_lock:
+        # Another thread may have refreshed while we waited for the lock.
+        tokens = _read_cached_tokens()
+        if tokens is None:
+            raise RuntimeError("No tokens found. Run the OAuth flow first (python main.py login).")
+        if is_access_token_expired(tokens):
+            print("Access token expired — refreshing...")
+            tokens = _refresh_and_publish(tokens)
 
     return tokens["access_token"]
+
+
+# ---------------------------------------------------------------------------
+# Proactive background refresh
+# ---------------------------------------------------------------------------
+
+_subscribers: list[Callable[[str], None]] = []
+_subscribers_lock = threading.Lock()
+
+
+def subscribe(callback: Callable[[str], None]) -> None:
+    """
+    Register callback(access_token) to be called whenever the token is refreshed.
+    Stream consumers use this to re-key RTSP URLs before the old token expires.
+    Callbacks run on the refreshing thread and should return quickly.
+    """
+    with _subscribers_lock:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[str], None]) -> None:
+    """Remove a callback registered with subscribe(). Unknown callbacks are ignored."""
+    with _subscribers_lock:
+        try:
+            _subscribers.remove(callback)
+        except ValueError:
+            pass
+
+
+def _refresh_and_publish(tokens: dict) -> dict:
+    """Refresh, persist and announce a new token. Caller must hold _token_lock."""
+    tokens = refresh_access_token(tokens["refresh_token"])
+    save_tokens(tokens)
+    with _subscribers_lock:
+        callbacks = list(_subscribers)
+    for callback in callbacks:
+        try:
+            callback(tokens["access_token"])
+        except Exception as e:
+            print(f"Token subscriber failed: {e}")
+    return tokens
+
+
+class TokenRefresher(threading.Thread):
+    """
+    Daemon thread that renews the access token lead_seconds before it expires.
+
+    Because the token is replaced well ahead of the 5-minute expiry buffer used by
+    get_valid_access_token, request threads never have to wait for a refresh.
+    """
+
+    def __init__(self, lead_seconds: float = 600, retry_seconds: float = 30):
+        super().__init__(name="een-token-refresher", daemon=True)
+        self.lead_seconds = lead_seconds
+        self.retry_seconds = retry_seconds
+        self._stop_event = threading.Event()
+
+    def _seconds_until_due(self, tokens: dict) -> float:
+        expires_in = tokens.get("expires_in", 0)
+        lead = min(self.lead_seconds, expires_in / 2)
+        return tokens.get("obtained_at", 0) + expires_in - lead - time.time()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            tokens = _read_cached_tokens()
+            if tokens is None:
+                self._stop_event.wait(self.retry_seconds)
+                continue
+
+            delay = self._seconds_until_due(tokens)
+            if delay > 0:
+                # Wake up at least every retry_seconds so tokens written by
+                # another process are noticed.
+                self._stop_event.wait(min(delay, max(self.retry_seconds, 1)))
+                continue
+
+            try:
+                with _token_lock:
+                    tokens = _read_cached_tokens()
+                    if tokens is not None and self._seconds_until_due(tokens) <= 0:
+                        print("Refreshing access token ahead of expiry...")
+                        _refresh_and_publish(tokens)
+            except Exception as e:
+                print(f"Background token refresh failed: {e}")
+                self._stop_event.wait(self.retry_seconds)
+
+    def stop(self) -> None:
+        """Ask the thread to exit; returns immediately."""
+        self._stop_event.set()
+
+
+_refresher: TokenRefresher | None = None
+
+
+def start_background_refresh(lead_seconds: float = config.TOKEN_REFRESH_LEAD_SECONDS) -> TokenRefresher:
+    """Start (once per process) the background token refresher and return it."""
+    global _refresher
+    with _subscribers_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = TokenRefresher(lead_seconds=lead_seconds)
+            _refresher.start()
+        return _refresher
@@ -0,0 +1,99 @@
+"""
+Benchmarks frame delivery from frames_gst: copied arrays vs. zero-copy leases.
+
+By default a synthetic 4K BGR source (videotestsrc) is used so no camera is needed;
+pass --rtsp to measure a live stream instead (uses config.CAMERA_ID).
+
+    python bench_frames.py                 # 4K synthetic, 300 frames per mode
+    python bench_frames.py --frames 600 --width 1920 --height 1080
+    python bench_frames.py --rtsp
+"""
+import argparse
+import time
+
+import gi
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+
+import frames_gst
+
+
+def _synthetic_pipeline(width: int, height: int, frames: int) -> Gst.Pipeline:
+    desc = (
+        f"videotestsrc num-buffers={frames} pattern=solid-color "
+        f"! video/x-raw,format=BGR,width={width},height={height} "
+        f"! appsink name=sink emit-signals=false sync=false"
+    )
+    return Gst.parse_launch(desc)
+
+
+def _run(pipeline: Gst.Pipeline, frames: int, zero_copy: bool) -> tuple[int, int, float]:
+    """Pull up to `frames` frames; return (frames, bytes, seconds)."""
+    pipeline.set_state(Gst.State.PLAYING)
+    sink = pipeline.get_by_name("sink")
+    dims: list = [None, None]
+    count = nbytes = 0
+    checksum = 0
+    started = None
+
+    try:
+        while count < frames:
+            if zero_copy:
+                lease, pts_ns = frames_gst._pull_lease(sink, dims)
+                if lease is None:
+                    if pts_ns == Gst.CLOCK_TIME_NONE:
+                        break
+                    continue
+                with lease:
+                    checksum += int(lease.frame[0, 0, 0])
+                    nbytes += lease.frame.nbytes
+            else:
+                frame, pts_ns = frames_gst._pull_bgr(sink, dims)
+                if frame is None:
+                    if pts_ns == Gst.CLOCK_TIME_NONE:
+                        break
+                    continue
+                checksum += int(frame[0, 0, 0])
+                nbytes += frame.nbytes
+            if started is None:
+                # Exclude pipeline startup from the measurement.
+                started = time.perf_counter()
+                nbytes = 0
+                continue
+            count += 1
+    finally:
+        pipeline.set_state(Gst.State.NULL)
+
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    return count, nbytes, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300, help="frames to measure per mode")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--rtsp", action="store_true", help="measure the live stream for config.CAMERA_ID")
+    args = parser.parse_args()
+
+    if args.rtsp:
+        import api
+        rtsp_url = api.get_live_stream()
+        make_pipeline = lambda: frames_gst._build_pipeline(rtsp_url)
+        source = "live RTSP"
+    else:
+        make_pipeline = lambda: _synthetic_pipeline(args.width, args.height, args.frames + 1)
+        source = f"synthetic {args.width}x{args.height} BGR"
+
+    print(f"Source: {source}, {args.frames} frames per mode\n")
+    print(f"  {'mode':<12}{'frames':>8}{'frames/s':>12}{'MB/s':>12}")
+    for label, zero_copy in (("copy", False), ("lease", True)):
+        count, nbytes, elapsed = _run(make_pipeline(), args.frames, zero_copy)
+        if not count or elapsed <= 0:
+            print(f"  {label:<12}{count:>8}{'-':>12}{'-':>12}")
+            continue
+        print(f"  {label:<12}{count:>8}{count / elapsed:>12.1f}{nbytes / elapsed / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmarks stream startup: connects repeatedly and reports how long each phase
+(connect, DESCRIBE/SETUP/PLAY, first RTP packet, first keyframe, first decoded
+frame, first RTCP SR) takes, as min / p50 / p95 / max over all runs.
+
+    python bench_startup.py                    # 10 connects to config.CAMERA_ID
+    python bench_startup.py --runs 30 --camera 100d4c41 --csv startup.csv
+"""
+import argparse
+import math
+import time
+
+import api
+import auth
+import frames_gst
+from latency_stats import SnapshotWriter
+
+
+def _connect_once(rtsp_url: str, wait_for_sr: float) -> frames_gst.StartupTiming:
+    """Open the stream, wait for the first frame (and up to wait_for_sr s for an SR), then close."""
+    startup = frames_gst.StartupTiming()
+    deadline = None
+    for _, capture_unix, _ in frames_gst.iter_frames_ntp(rtsp_url, timeout=30.0, startup=startup):
+        if startup.first_rtcp_ms is not None or capture_unix is not None:
+            break
+        if deadline is None:
+            deadline = time.monotonic() + wait_for_sr
+        elif time.monotonic() >= deadline:
+            break
+    return startup
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[max(0, math.ceil(q / 100.0 * len(sorted_values)) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="number of connects (default 10)")
+    parser.add_argument("--camera", default=None, help="camera ID (default: EEN_CAMERA_ID)")
+    parser.add_argument("--stream-type", default="main", choices=("main", "preview"))
+    parser.add_argument("--wait-for-sr", type=float, default=5.0,
+                        help="seconds to keep the stream open after the first frame waiting for an RTCP SR")
+    parser.add_argument("--pause", type=float, default=1.0, help="seconds between runs")
+    parser.add_argument("--csv", default=None, help="write one row per run to this CSV file")
+    args = parser.parse_args()
+    auth.start_background_refresh()
+
+    writer = SnapshotWriter(csv_path=args.csv)
+    samples: dict[str, list[float]] = {phase: [] for phase in frames_gst.StartupTiming.PHASES}
+
+    for run in range(1, args.runs + 1):
+        # Resolved per run so the token stays fresh on long benchmarks; cached by api.py.
+        rtsp_url = api.get_live_stream(args.camera, stream_type=args.stream_type)
+        startup = _connect_once(rtsp_url, args.wait_for_sr)
+        row = startup.as_dict()
+        writer.write({"run": run, **row})
+        for phase, value in row.items():
+            if value is not None:
+                samples[phase].append(value)
+        first_frame = f"{startup.first_frame_ms:.0f} ms" if startup.first_frame_ms is not None else "none"
+        print(f"  run {run:>3}: first frame {first_frame}")
+        time.sleep(args.pause)
+
+    print(f"\n  {'phase':<20}{'runs':>6}{'min':>9}{'p50':>9}{'p95':>9}{'max':>9}   (ms after PLAYING)")
+    for phase, values in samples.items():
+        if not values:
+            print(f"  {phase:<20}{0:>6}{'-':>9}{'-':>9}{'-':>9}{'-':>9}")
+            continue
+        values.sort()
+        print(f"  {phase:<20}{len(values):>6}{values[0]:>9.0f}{_percentile(values, 50):>9.0f}"
+              f"{_percentile(values, 95):>9.0f}{values[-1]:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
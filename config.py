@@ -39,5 +39,17 @@ CALLBACK_PORT = 3333
 # Token storage file
 TOKEN_FILE = "tokens.json"
 
+# Resolved account base URL, persisted between runs (see api._get_base_url)
+BASE_URL_FILE = "base_url.json"
+BASE_URL_TTL = 24 * 60 * 60  # seconds
+
+# Seconds before expiry at which auth.TokenRefresher renews the access token
+TOKEN_REFRESH_LEAD_SECONDS = 600
+
 # Camera ID to use for stream requests
 CAMERA_ID = os.getenv("EEN_CAMERA_ID", "")
+
+# Shared HTTP connection pool used by api.py and auth.py
+HTTP_POOL_SIZE = int(os.getenv("EEN_HTTP_POOL_SIZE", "4"))               # idle connections kept per host
+HTTP_POOL_IDLE_TIMEOUT = float(os.getenv("EEN_HTTP_POOL_IDLE_TIMEOUT", "60"))  # seconds
+HTTP_TIMEOUT = float(os.getenv("EEN_HTTP_TIMEOUT", "30"))                 # socket timeout, seconds
@@ -0,0 +1,436 @@
+"""
+Local shared-memory frame bus: decode each camera once, read it from many processes.
+
+A publisher decodes a camera's stream and writes every frame into a ring of
+slots in a multiprocessing.shared_memory segment named after the camera.
+Readers in other processes attach to it by camera ID and read frames in
+place, without copying them and without opening another RTSP session.
+
+    python frame_bus.py publish                 # EEN_CAMERA_ID
+    python frame_bus.py publish CAM1 CAM2 --slots 8 --width 1280 --height 720
+    python frame_bus.py publish CAM1 --replace  # take over a bus left behind by a crash
+    python frame_bus.py show CAM1               # display from the bus (any number of times)
+    python frame_bus.py snapshot CAM1 out.jpg
+    python frame_bus.py stats CAM1
+
+From Python:
+
+    reader = frame_bus.FrameReader(camera_id)
+    for item in reader:                 # newest frame each time; skipped frames are counted
+        process(item.frame)             # read-only view into shared memory
+        if not item.is_valid():         # the publisher overwrote the slot meanwhile
+            ...
+
+Each slot is guarded by a sequence lock: the publisher makes the slot's
+sequence number odd while it writes and even once the frame is complete, so
+a reader can always tell whether the frame it looked at was torn or lapped.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+_MAGIC = b"EENB"
+_VERSION = 1
+
+# Segment header: magic, version, slots, height, width, channels (0 = 2-D frame),
+# slot stride, frame bytes, publisher pid; then the mutable fields below.
+_HEADER = struct.Struct("<4sIIIIIQQI")
+_LATEST = struct.Struct("<q")      # frame number of the newest complete frame, -1 = none yet
+_HEARTBEAT = struct.Struct("<d")   # time.time() of the last publish
+_CLOSED = struct.Struct("<I")      # 1 once the publisher has stopped
+_LATEST_AT = _HEADER.size
+_HEARTBEAT_AT = _LATEST_AT + _LATEST.size
+_CLOSED_AT = _HEARTBEAT_AT + _HEARTBEAT.size
+_HEADER_BYTES = 128
+
+# Per-slot header: sequence lock, frame number, timestamp; frame data follows at _SLOT_DATA.
+_SLOT = struct.Struct("<QQd")
+_SLOT_DATA = 64
+
+
+# Segments created by publishers in this process. Their resource-tracker
+# registration belongs to the publisher, so readers here must not drop it.
+_created_here: set[str] = set()
+
+
+def segment_name(camera_id: str) -> str:
+    """Shared-memory name for camera_id (short and portable: macOS allows 31 characters)."""
+    return "een_" + re.sub(r"[^A-Za-z0-9]", "", camera_id)[:24]
+
+
+def _align(n: int, to: int = 64) -> int:
+    return (n + to - 1) // to * to
+
+
+@dataclass
+class BusFrame:
+    """A frame read from the bus. `frame` is a read-only view into shared memory unless copied."""
+    frame: np.ndarray
+    frame_no: int
+    timestamp: float        # time.time() at which the publisher received the frame
+    _reader: FrameReader | None = None
+
+    def is_valid(self) -> bool:
+        """True while the publisher has not started overwriting this frame's slot."""
+        return self._reader is None or self._reader._slot_seq(self.frame_no) == 2 * self.frame_no + 2
+
+
+class FramePublisher:
+    """
+    Writes frames for one camera into a shared-memory ring.
+
+    The segment is created on the first publish(), when the frame shape is
+    known, and unlinked by close(). Every frame must have that same shape.
+
+    Args:
+        camera_id: Camera the frames belong to; readers attach by this ID.
+        slots:     Frames kept in the ring. A zero-copy view stays valid until
+                   the publisher has written slots - 1 newer frames.
+        replace:   Unlink an existing bus for camera_id instead of failing. Only
+                   use this for a bus left behind by a publisher that crashed.
+
+    Raises:
+        FileExistsError from publish() if the bus already exists and replace is False.
+    """
+
+    def __init__(self, camera_id: str, slots: int = 4, replace: bool = False):
+        if slots < 2:
+            raise ValueError("A frame bus needs at least 2 slots.")
+        self.camera_id = camera_id
+        self.slots = slots
+        self.replace = replace
+        self.published = 0
+        self._shm: shared_memory.SharedMemory | None = None
+        self._shape: tuple[int, ...] | None = None
+        self._stride = 0
+
+    def _create(self, frame: np.ndarray) -> None:
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 0
+        self._shape = frame.shape
+        self._stride = _SLOT_DATA + _align(frame.nbytes)
+        name = segment_name(self.camera_id)
+        size = _HEADER_BYTES + self.slots * self._stride
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not self.replace:
+                raise FileExistsError(
+                    f"A frame bus for camera {self.camera_id} already exists ({name!r}). Another publisher "
+                    "may be running; pass replace=True (--replace) only if it crashed.") from None
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created_here.add(name)
+        buf = self._shm.buf
+        _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, self.slots, height, width, channels,
+                          self._stride, frame.nbytes, os.getpid())
+        _LATEST.pack_into(buf, _LATEST_AT, -1)
+        _HEARTBEAT.pack_into(buf, _HEARTBEAT_AT, time.time())
+        _CLOSED.pack_into(buf, _CLOSED_AT, 0)
+        for slot in range(self.slots):
+            _SLOT.pack_into(buf, _HEADER_BYTES + slot * self._stride, 0, 0, 0.0)
+
+    def publish(self, frame: np.ndarray, timestamp: float | None = None) -> int:
+        """Copy frame into the next slot and make it the latest. Returns its frame number."""
+        if self._shm is None:
+            self._create(frame)
+        elif frame.shape != self._shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match the bus shape {self._shape}; "
+                             "fix the size with PipelineOptions(width=, height=).")
+
+        n = self.published
+        offset = _HEADER_BYTES + (n % self.slots) * self._stride
+        buf = self._shm.buf
+        struct.pack_into("<Q", buf, offset, 2 * n + 1)  # odd: write in progress
+        dest = np.ndarray(frame.shape, np.uint8, buffer=buf, offset=offset + _SLOT_DATA)
+        np.copyto(dest, frame)
+        del dest
+        _SLOT.pack_into(buf, offset, 2 * n + 2, n, timestamp if timestamp is not None else time.time())
+        _LATEST.pack_into(buf, _LATEST_AT, n)
+        _HEARTBEAT.pack_into(buf, _HEARTBEAT_AT, time.time())
+        self.published += 1
+        return n
+
+    def close(self) -> None:
+        """Mark the bus closed for readers and remove the segment."""
+        if self._shm is None:
+            return
+        _CLOSED.pack_into(self._shm.buf, _CLOSED_AT, 1)
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _created_here.discard(segment_name(self.camera_id))
+        self._shm = None
+
+    def __enter__(self) -> FramePublisher:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FrameReader:
+    """
+    Attaches to the frame bus of one camera.
+
+    Iterating yields the newest frame each time one is published; frames that
+    were overwritten before the reader got to them are skipped and counted in
+    `missed`. Iteration ends when the publisher closes the bus or stops
+    publishing for stale_timeout seconds.
+
+    Args:
+        camera_id:     Camera to attach to.
+        copy:          Yield private copies instead of zero-copy views.
+        stale_timeout: Seconds without a publish before the bus is considered dead.
+        wait:          Seconds to wait for the publisher to create the bus.
+
+    Raises:
+        FileNotFoundError if no publisher created the bus within `wait` seconds.
+    """
+
+    _POLL_SECONDS = 0.002
+
+    def __init__(self, camera_id: str, copy: bool = False, stale_timeout: float = 10.0, wait: float = 0.0):
+        self.camera_id = camera_id
+        self.copy = copy
+        self.stale_timeout = stale_timeout
+        self.received = 0
+        self.missed = 0
+        self._shm = self._attach(segment_name(camera_id), wait)
+        magic, version, self.slots, height, width, channels, self._stride, self._nbytes, self.publisher_pid = \
+            _HEADER.unpack_from(self._shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._shm.close()
+            raise ValueError(f"Shared memory {segment_name(camera_id)!r} is not a version {_VERSION} frame bus.")
+        self.shape = (height, width, channels) if channels else (height, width)
+        self._last = -1
+
+    @staticmethod
+    def _attach(name: str, wait: float) -> shared_memory.SharedMemory:
+        deadline = time.monotonic() + wait
+        while True:
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+                break
+            except FileNotFoundError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+        # Before Python 3.13 an attaching process also registers the segment with
+        # its resource tracker, which would unlink it when this reader exits. A
+        # publisher in this process shares that registration, so leave it alone.
+        if name not in _created_here:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+    def _slot_offset(self, frame_no: int) -> int:
+        return _HEADER_BYTES + (frame_no % self.slots) * self._stride
+
+    def _slot_seq(self, frame_no: int) -> int:
+        return struct.unpack_from("<Q", self._shm.buf, self._slot_offset(frame_no))[0]
+
+    @property
+    def latest(self) -> int:
+        return _LATEST.unpack_from(self._shm.buf, _LATEST_AT)[0]
+
+    @property
+    def closed(self) -> bool:
+        return bool(_CLOSED.unpack_from(self._shm.buf, _CLOSED_AT)[0])
+
+    @property
+    def heartbeat_age(self) -> float:
+        return time.time() - _HEARTBEAT.unpack_from(self._shm.buf, _HEARTBEAT_AT)[0]
+
+    def read(self, frame_no: int) -> BusFrame | None:
+        """Read frame_no, or None if it is not complete or has already been overwritten."""
+        offset = self._slot_offset(frame_no)
+        seq, stored_no, timestamp = _SLOT.unpack_from(self._shm.buf, offset)
+        if seq != 2 * frame_no + 2 or stored_no != frame_no:
+            return None
+        view = np.ndarray(self.shape, np.uint8, buffer=self._shm.buf, offset=offset + _SLOT_DATA)
+        if self.copy:
+            frame = view.copy()
+            del view
+            if self._slot_seq(frame_no) != seq:
+                return None  # torn: the publisher lapped us while we copied
+            return BusFrame(frame, frame_no, timestamp)
+        view.flags.writeable = False
+        return BusFrame(view, frame_no, timestamp, self)
+
+    def read_latest(self) -> BusFrame | None:
+        """The newest complete frame, or None if nothing has been published yet."""
+        latest = self.latest
+        return self.read(latest) if latest >= 0 else None
+
+    def __iter__(self):
+        while True:
+            latest = self.latest
+            if latest > self._last:
+                item = self.read(latest)
+                if item is not None:
+                    if self._last >= 0:
+                        self.missed += latest - self._last - 1
+                    self._last = latest
+                    self.received += 1
+                    yield item
+                    continue
+            if self.closed or self.heartbeat_age > self.stale_timeout:
+                return
+            time.sleep(self._POLL_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "camera_id": self.camera_id,
+            "shape": self.shape,
+            "slots": self.slots,
+            "publisher_pid": self.publisher_pid,
+            "latest": self.latest,
+            "heartbeat_age_s": round(self.heartbeat_age, 3),
+            "closed": self.closed,
+            "received": self.received,
+            "missed": self.missed,
+        }
+
+    def close(self) -> None:
+        """Detach. Any zero-copy frame from this reader must no longer be used."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self) -> FrameReader:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def publish_camera(
+    camera_id: str, slots: int = 4, options=None, stop: threading.Event | None = None, replace: bool = False
+) -> None:
+    """
+    Decode camera_id once and publish its frames to the bus until stop is set.
+    Reconnects (with a fresh token) whenever the stream drops.
+    """
+    import api
+    import frames_gst
+
+    source = frames_gst.ResilientFrameSource(lambda: api.get_live_stream(camera_id), options=options)
+    with FramePublisher(camera_id, slots=slots, replace=replace) as publisher:
+        for frame in source:
+            publisher.publish(frame)
+            if stop is not None and stop.is_set():
+                break
+
+
+def _cmd_publish(args: argparse.Namespace) -> None:
+    import auth
+    import config
+    import frames_gst
+
+    auth.start_background_refresh()  # publishers run for days; renew tokens ahead of expiry
+
+    camera_ids = args.camera_ids or [config.CAMERA_ID]
+    options = frames_gst.PipelineOptions(width=args.width, height=args.height, max_fps=args.fps)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=publish_camera, args=(cid, args.slots, options, stop, args.replace),
+                         name=f"een-bus-{cid}", daemon=True)
+        for cid in camera_ids
+    ]
+    for thread in threads:
+        thread.start()
+    print(f"Publishing {', '.join(camera_ids)} ({args.slots} slots each). Ctrl+C to stop.")
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=5.0)
+
+
+def _cmd_show(args: argparse.Namespace) -> None:
+    import cv2
+
+    with FrameReader(args.camera_id, wait=args.wait) as reader:
+        print("Press 'q' in the window to quit.")
+        for item in reader:
+            cv2.imshow(f"EEN bus {args.camera_id}", item.frame)
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                break
+        cv2.destroyAllWindows()
+        print(f"Shown {reader.received} frames, skipped {reader.missed}.")
+
+
+def _cmd_snapshot(args: argparse.Namespace) -> None:
+    import cv2
+
+    with FrameReader(args.camera_id, copy=True, wait=args.wait) as reader:
+        for item in reader:
+            cv2.imwrite(args.output, item.frame)
+            print(f"Snapshot saved to {args.output}")
+            return
+    print("The bus closed before a frame was published.")
+    sys.exit(1)
+
+
+def _cmd_stats(args: argparse.Namespace) -> None:
+    with FrameReader(args.camera_id, wait=args.wait) as reader:
+        for key, value in reader.stats().items():
+            print(f"  {key:<16}{value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    publish = sub.add_parser("publish", help="decode cameras and publish them to the bus")
+    publish.add_argument("camera_ids", nargs="*", metavar="CAMERA_ID", help="default: EEN_CAMERA_ID")
+    publish.add_argument("--slots", type=int, default=4, help="frames kept per camera (default 4)")
+    publish.add_argument("--width", type=int, default=None)
+    publish.add_argument("--height", type=int, default=None)
+    publish.add_argument("--fps", type=int, default=None, help="cap the published frame rate")
+    publish.add_argument("--replace", action="store_true",
+                         help="take over an existing bus (only after a publisher crashed)")
+    publish.set_defaults(func=_cmd_publish)
+
+    for name, func, help_text in (
+        ("show", _cmd_show, "display a camera from the bus"),
+        ("snapshot", _cmd_snapshot, "save the next frame from the bus"),
+        ("stats", _cmd_stats, "print bus counters for a camera"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("camera_id", metavar="CAMERA_ID")
+        if name == "snapshot":
+            cmd.add_argument("output", nargs="?", default="snapshot.jpg")
+        cmd.add_argument("--wait", type=float, default=5.0, help="seconds to wait for a publisher")
+        cmd.set_defaults(func=func)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except FileNotFoundError:
+        if args.command == "publish":
+            raise
+        print(f"No frame bus for camera {args.camera_id}. Start one with: python frame_bus.py publish {args.camera_id}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
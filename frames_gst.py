@@ -7,14 +7,22 @@ All stream decoding goes through GStreamer pipelines.
 """
 from __future__ import annotations
 
+import multiprocessing
+import os
+import queue as queue_module
+import random
+import threading
 import time
+from collections import deque
 from collections.abc import Generator
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Callable
 
 import gi
 gi.require_version("Gst", "1.0")
-from gi.repository import Gst
+from gi.repository import GLib, Gst
 
 import cv2
 import numpy as np
@@ -46,61 +54,407 @@ class FrameTiming:
         return (self.received_at - self.estimated_capture_time) * 1000.0
 
 
+@dataclass
+class StartupTiming:
+    """
+    Milliseconds from pipeline.set_state(PLAYING) to each startup milestone.
+    A field stays None until (unless) that milestone is reached.
+
+    Pass an instance to any iterator via `startup=`; it is filled in as the
+    stream comes up and can be read at any time, e.g. after the first frame.
+    """
+    connect_ms: float | None = None         # rtspsrc starts DNS lookup + TCP connect
+    options_ms: float | None = None         # connected; RTSP OPTIONS sent
+    describe_ms: float | None = None        # RTSP DESCRIBE sent
+    setup_ms: float | None = None           # first RTSP SETUP sent
+    setup_done_ms: float | None = None      # last SETUP answered; stream opened
+    play_ms: float | None = None            # RTSP PLAY sent
+    play_done_ms: float | None = None       # PLAY answered
+    first_rtp_ms: float | None = None       # first RTP packet out of rtspsrc
+    first_keyframe_ms: float | None = None  # first keyframe into the decoder
+    first_frame_ms: float | None = None     # first decoded frame at the appsink
+    first_rtcp_ms: float | None = None      # first RTCP sender report (NTP mapping available)
+    started_at: float = 0.0                 # time.monotonic() at PLAYING
+
+    PHASES = (
+        "connect_ms", "options_ms", "describe_ms", "setup_ms", "setup_done_ms", "play_ms", "play_done_ms",
+        "first_rtp_ms", "first_keyframe_ms", "first_frame_ms", "first_rtcp_ms",
+    )
+
+    def mark(self, phase: str) -> None:
+        """Record phase at the current time, unless it was already recorded."""
+        if getattr(self, phase) is None and self.started_at:
+            setattr(self, phase, round((time.monotonic() - self.started_at) * 1000.0, 1))
+
+    def as_dict(self) -> dict[str, float | None]:
+        return {phase: getattr(self, phase) for phase in self.PHASES}
+
+
+# rtspsrc progress message text -> StartupTiming phase. The first match wins, so
+# the specific messages come before the broad "setup" needle. rtspsrc posts
+# "Opened Stream" once SETUP is done, before "Sending PLAY request"; the PLAY
+# reply is announced by "Sent PLAY request".
+_RTSP_PROGRESS_PHASES = (
+    ("connecting", "connect_ms"),
+    ("server options", "options_ms"),
+    ("media info", "describe_ms"),
+    ("opened stream", "setup_done_ms"),
+    ("sending play", "play_ms"),
+    ("sent play", "play_done_ms"),
+    ("setup", "setup_ms"),
+)
+
+
+def _instrument_startup(pipeline: Gst.Pipeline, startup: StartupTiming) -> None:
+    """Attach bus, signal and pad probes that fill in startup. Call before PLAYING."""
+    def first_buffer_probe(phase: str, keyframes_only: bool = False):
+        def probe(pad, info):
+            buf = info.get_buffer()
+            if keyframes_only and buf is not None and buf.has_flags(Gst.BufferFlags.DELTA_UNIT):
+                return Gst.PadProbeReturn.OK
+            startup.mark(phase)
+            return Gst.PadProbeReturn.REMOVE
+        return probe
+
+    def on_sync_message(bus, message):
+        if message.type == Gst.MessageType.PROGRESS:
+            _, _, text = message.parse_progress()
+            text = (text or "").lower()
+            for needle, phase in _RTSP_PROGRESS_PHASES:
+                if needle in text:
+                    startup.mark(phase)
+                    break
+
+    bus = pipeline.get_bus()
+    bus.enable_sync_message_emission()
+    bus.connect("sync-message", on_sync_message)
+
+    src = pipeline.get_by_name("src")
+    src.connect("pad-added", lambda _src, pad: pad.add_probe(
+        Gst.PadProbeType.BUFFER, first_buffer_probe("first_rtp_ms")))
+    src.connect("new-manager", lambda _src, manager: manager.connect(
+        "on-ssrc-active", lambda *_: startup.mark("first_rtcp_ms")))
+
+    def on_element_added(_bin, _sub_bin, element):
+        factory = element.get_factory()
+        klass = factory.get_metadata("klass") if factory else ""
+        if "Decoder" in klass and "Video" in klass:
+            element.get_static_pad("sink").add_probe(
+                Gst.PadProbeType.BUFFER, first_buffer_probe("first_keyframe_ms", keyframes_only=True))
+
+    pipeline.connect("deep-element-added", on_element_added)
+    pipeline.get_by_name("sink").get_static_pad("sink").add_probe(
+        Gst.PadProbeType.BUFFER, first_buffer_probe("first_frame_ms"))
+
+
+def _start(pipeline: Gst.Pipeline, startup: StartupTiming | None) -> None:
+    """Set pipeline to PLAYING, instrumenting startup first if requested."""
+    if startup is not None:
+        _instrument_startup(pipeline, startup)
+        startup.started_at = time.monotonic()
+    pipeline.set_state(Gst.State.PLAYING)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline options
+# ---------------------------------------------------------------------------
+
+# Bytes per pixel of the packed output formats. I420 is planar (see _frame_view).
+_PIXEL_BYTES = {"BGR": 3, "RGB": 3, "GRAY8": 1}
+OUTPUT_FORMATS = (*_PIXEL_BYTES, "I420")
+
+
+@dataclass
+class PipelineOptions:
+    """
+    Decode tuning for the frame iterators. The defaults give full-resolution BGR.
+
+    Frame shapes by format: BGR/RGB -> (H, W, 3), GRAY8 -> (H, W),
+    I420 -> (H * 3 // 2, W) planar Y, U, V (W must be a multiple of 8).
+    GRAY8 and I420 skip most or all of the colour conversion work.
+    """
+    width: int | None = None          # downscale target (videoscale); None keeps the source size
+    height: int | None = None
+    max_fps: int | None = None        # drop frames above this rate (videorate)
+    format: str = "BGR"               # one of OUTPUT_FORMATS
+    convert_threads: int | None = None  # videoconvert n-threads; None = GStreamer default
+    keyframes_only: bool = False      # decode only keyframes (drops delta units before decodebin)
+
+    def __post_init__(self):
+        if self.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported format {self.format!r}; expected one of {OUTPUT_FORMATS}")
+        if self.format == "I420" and ((self.width or 0) % 8 or (self.height or 0) % 2):
+            raise ValueError("I420 output needs a width divisible by 8 and an even height")
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-def _build_pipeline(rtsp_url: str, ntp_sync: bool = False) -> Gst.Pipeline:
+def _build_pipeline(
+    rtsp_url: str,
+    ntp_sync: bool = False,
+    options: PipelineOptions | None = None,
+) -> Gst.Pipeline:
+    opts = options or PipelineOptions()
     ntp_opts = "ntp-sync=true" if ntp_sync else ""
-    desc = (
-        f'rtspsrc location="{rtsp_url}" protocols=tcp latency=0 {ntp_opts} '
-        f'! decodebin '
-        f'! videoconvert '
-        f'! video/x-raw,format=BGR '
-        f'! appsink name=sink emit-signals=false sync=false'
-    )
-    return Gst.parse_launch(desc)
+
+    elements = [f'rtspsrc name=src location="{rtsp_url}" protocols=tcp latency=0 {ntp_opts}']
+    if opts.keyframes_only:
+        # parsebin depayloads/parses so buffers carry keyframe flags; identity drops the rest.
+        elements += ["parsebin", "identity drop-buffer-flags=delta-unit"]
+    elements.append("decodebin")
+    elements += _raw_video_tail(opts)
+
+    return Gst.parse_launch(" ! ".join(elements))
+
+
+def _raw_video_tail(opts: PipelineOptions) -> list[str]:
+    """Elements after the decoder: rate cap, scaling, conversion to opts.format, appsink."""
+    elements = []
+    if opts.max_fps:
+        elements.append(f"videorate drop-only=true max-rate={opts.max_fps}")
+    if opts.width or opts.height:
+        elements.append("videoscale")
+    elements.append(f"videoconvert n-threads={opts.convert_threads}" if opts.convert_threads else "videoconvert")
+
+    caps = f"video/x-raw,format={opts.format}"
+    if opts.width:
+        caps += f",width={opts.width}"
+    if opts.height:
+        caps += f",height={opts.height}"
+    elements += [caps, "appsink name=sink emit-signals=false sync=false"]
+    return elements
+
+
+def _frame_view(data, fmt: str, width: int, height: int) -> np.ndarray:
+    """Wrap raw video memory as an array without copying. Rows are 4-byte aligned by GStreamer."""
+    if fmt == "I420":
+        if width % 8 or height % 2:
+            raise ValueError("I420 frames need a width divisible by 8 and an even height")
+        return np.frombuffer(data, np.uint8, count=width * height * 3 // 2).reshape((height * 3 // 2, width))
+    bpp = _PIXEL_BYTES[fmt]
+    stride = (width * bpp + 3) & ~3
+    rows = np.frombuffer(data, np.uint8, count=stride * height).reshape((height, stride))[:, :width * bpp]
+    return rows.reshape((height, width, bpp)) if bpp > 1 else rows
+
+
+def _pull_sample(sink: Gst.Element, dims: list, timeout_ns: int | None = None) -> Gst.Sample | None:
+    """
+    Pull one sample from an appsink, recording frame dimensions on first use.
+    With timeout_ns, returns None after that long without a sample (check sink.is_eos()).
+    """
+    if timeout_ns is None:
+        sample = sink.emit("pull-sample")
+    else:
+        sample = sink.emit("try-pull-sample", timeout_ns)
+    if sample is not None and dims[0] is None:
+        s = sample.get_caps().get_structure(0)
+        dims[0] = s.get_value("width")
+        dims[1] = s.get_value("height")
+    return sample
+
+
+def _map_frame(buf: Gst.Buffer, dims: list, fmt: str = "BGR"):
+    """
+    Map buf for reading and wrap it as an array view without copying.
+
+    Returns (mapinfo, view), or (None, None) if the buffer could not be mapped.
+    The caller must drop the view before calling buf.unmap(mapinfo). A frame
+    size the format cannot be viewed at (e.g. unaligned I420 from the source)
+    raises ValueError, since every later frame would fail the same way.
+    """
+    try:
+        ok, mi = buf.map(Gst.MapFlags.READ)
+    except (ValueError, TypeError):
+        return None, None
+    if not ok:
+        return None, None
+    try:
+        view = _frame_view(mi.data, fmt, dims[0], dims[1])
+    except Exception:
+        buf.unmap(mi)
+        raise
+    return mi, view
 
 
 def _pull_bgr(
-    sink: Gst.Element, dims: list
+    sink: Gst.Element, dims: list, fmt: str = "BGR"
 ) -> tuple[np.ndarray | None, int]:
     """
-    Pull one sample from an appsink element.
+    Pull one sample from an appsink element (BGR unless the pipeline was built for fmt).
 
     Returns (frame, pts_ns). (None, CLOCK_TIME_NONE) = end-of-stream.
     (None, pts_ns) with pts_ns != CLOCK_TIME_NONE = transient failure, skip.
     """
-    sample = sink.emit("pull-sample")
+    sample = _pull_sample(sink, dims)
     if sample is None:
         return None, Gst.CLOCK_TIME_NONE
 
     buf = sample.get_buffer()
     pts_ns = buf.pts
 
-    if dims[0] is None:
-        s = sample.get_caps().get_structure(0)
-        dims[0] = s.get_value("width")
-        dims[1] = s.get_value("height")
-
-    try:
-        ok, mi = buf.map(Gst.MapFlags.READ)
-    except (ValueError, TypeError):
-        return None, pts_ns
-    if not ok:
+    mi, view = _map_frame(buf, dims, fmt)
+    if mi is None:
         return None, pts_ns
     try:
-        frame = np.frombuffer(mi.data, np.uint8).reshape((dims[1], dims[0], 3)).copy()
-    except (ValueError, TypeError):
-        frame = None
+        frame = view.copy()
     finally:
+        del view
         buf.unmap(mi)
-
-    if frame is None:
-        return None, pts_ns
     return frame, pts_ns
 
 
+class FrameLease:
+    """
+    A decoded frame borrowed directly from GStreamer's buffer, without a copy.
+
+    `frame` is a read-only view into the mapped Gst.Buffer ((H, W, 3) for BGR). The
+    mapping is held until release() is called (or the `with` block exits), so
+    the frame must not be used — or referenced — after that. Call
+    `lease.frame.copy()` to keep pixels beyond the lease.
+    """
+
+    __slots__ = ("frame", "pts_ns", "_sample", "_buf", "_mapinfo")
+
+    def __init__(self, sample: Gst.Sample, buf: Gst.Buffer, mapinfo, view: np.ndarray):
+        view.flags.writeable = False
+        self.frame: np.ndarray | None = view
+        self.pts_ns: int = buf.pts
+        self._sample = sample   # keeps the buffer alive while it is mapped
+        self._buf = buf
+        self._mapinfo = mapinfo
+
+    @property
+    def released(self) -> bool:
+        return self._mapinfo is None
+
+    def release(self) -> None:
+        """Unmap the underlying buffer. Safe to call more than once."""
+        if self._mapinfo is None:
+            return
+        self.frame = None
+        try:
+            self._buf.unmap(self._mapinfo)
+        finally:
+            self._mapinfo = None
+            self._buf = None
+            self._sample = None
+
+    def __enter__(self) -> FrameLease:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def _pull_lease(sink: Gst.Element, dims: list, fmt: str = "BGR") -> tuple[FrameLease | None, int]:
+    """Like _pull_bgr, but returns a zero-copy FrameLease instead of a copied array."""
+    sample = _pull_sample(sink, dims)
+    if sample is None:
+        return None, Gst.CLOCK_TIME_NONE
+
+    buf = sample.get_buffer()
+    mi, view = _map_frame(buf, dims, fmt)
+    if mi is None:
+        return None, buf.pts
+    return FrameLease(sample, buf, mi, view), buf.pts
+
+
+# ---------------------------------------------------------------------------
+# Decoupled frame queue
+# ---------------------------------------------------------------------------
+
+QUEUE_POLICIES = ("drop-oldest", "drop-newest", "block")
+
+
+class FrameQueue:
+    """
+    Bounded hand-off between a decoder thread and a consumer.
+
+    Pass an instance to iter_frames via `queue=` to decode on a background
+    thread: frames are pulled from appsink as fast as they arrive, so a slow
+    consumer never lets appsink buffer without bound. When the queue is full:
+        drop-oldest: discard the oldest queued frame (live view: always the newest frame)
+        drop-newest: discard the incoming frame (keeps a contiguous run of older frames)
+        block:       stall the decoder until the consumer catches up (no frame is lost;
+                     back-pressure reaches rtspsrc, so latency grows instead)
+
+    The counters can be read at any time, from any thread, via stats().
+
+    Args:
+        maxsize: Frames held at most (>= 1).
+        policy:  One of QUEUE_POLICIES.
+    """
+
+    def __init__(self, maxsize: int = 1, policy: str = "drop-oldest"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}'. Choose from: {', '.join(QUEUE_POLICIES)}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.received = 0     # frames put by the decoder
+        self.delivered = 0    # frames taken by the consumer
+        self.dropped = 0      # frames discarded by the policy
+        self.max_depth = 0    # high-water mark of the queue
+
+    def put(self, item) -> bool:
+        """Add a frame according to the policy. Returns False once the queue is closed."""
+        with self._cond:
+            if self._closed:
+                return False
+            self.received += 1
+            if len(self._items) >= self.maxsize:
+                if self.policy == "drop-oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == "drop-newest":
+                    self.dropped += 1
+                    return True
+                else:
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return False
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float | None = None):
+        """Return the next frame, or None once the queue is closed and empty (or on timeout)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self.delivered += 1
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Stop accepting frames and wake any waiting producer or consumer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "policy": self.policy,
+                "received": self.received,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "depth": len(self._items),
+                "max_depth": self.max_depth,
+            }
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -108,6 +462,9 @@ def _pull_bgr(
 def iter_frames(
     rtsp_url: str,
     on_frame: Callable[[np.ndarray, int], bool] | None = None,
+    options: PipelineOptions | None = None,
+    startup: StartupTiming | None = None,
+    queue: FrameQueue | None = None,
 ) -> Generator[np.ndarray, None, None]:
     """
     Connect to an RTSP stream and yield decoded frames as BGR numpy arrays.
@@ -116,33 +473,108 @@ def iter_frames(
         rtsp_url: Full RTSP URL (including access_token param).
         on_frame: Optional callback(frame, frame_number) -> bool.
                   Return False from the callback to stop iteration.
+        options:  Optional PipelineOptions (downscale, fps cap, output format...).
+        startup:  Optional StartupTiming to fill in with connect/first-frame milestones.
+        queue:    Optional FrameQueue. If given, frames are decoded on a background
+                  thread into the queue and yielded from it, so a slow consumer
+                  cannot stall the decoder (see FrameQueue for the drop policies).
 
     Yields:
-        numpy.ndarray: BGR image frames, shape (H, W, 3).
+        numpy.ndarray: BGR image frames, shape (H, W, 3), or the shape of options.format.
     """
-    pipeline = _build_pipeline(rtsp_url)
-    pipeline.set_state(Gst.State.PLAYING)
+    fmt = (options or PipelineOptions()).format
+    pipeline = _build_pipeline(rtsp_url, options=options)
     sink = pipeline.get_by_name("sink")
+    if queue is not None and queue.policy == "block":
+        # Let back-pressure reach upstream instead of piling up inside appsink.
+        sink.set_property("max-buffers", 1)
+    _start(pipeline, startup)
     dims: list = [None, None]
     frame_number = 0
+    decoder = None
+
+    def next_frame() -> np.ndarray | None:
+        while True:
+            frame, pts_ns = _pull_bgr(sink, dims, fmt)
+            if frame is not None or pts_ns == Gst.CLOCK_TIME_NONE:
+                return frame
+
+    def decode_into_queue() -> None:
+        try:
+            while True:
+                frame = next_frame()
+                if frame is None or not queue.put(frame):
+                    break
+        finally:
+            queue.close()
+
+    if queue is not None:
+        decoder = threading.Thread(target=decode_into_queue, name="een-decoder", daemon=True)
+        decoder.start()
 
     try:
         while True:
-            frame, pts_ns = _pull_bgr(sink, dims)
+            frame = next_frame() if queue is None else queue.get()
             if frame is None:
-                if pts_ns == Gst.CLOCK_TIME_NONE:
-                    break
-                continue
+                break
             frame_number += 1
             if on_frame is not None and on_frame(frame, frame_number) is False:
                 break
             yield frame
     finally:
+        if queue is not None:
+            queue.close()
+        pipeline.set_state(Gst.State.NULL)  # unblocks a pending pull-sample
+        if decoder is not None:
+            decoder.join(timeout=5.0)
+
+
+def iter_frame_leases(
+    rtsp_url: str,
+    options: PipelineOptions | None = None,
+    startup: StartupTiming | None = None,
+) -> Generator[FrameLease, None, None]:
+    """
+    Zero-copy variant of iter_frames: yields FrameLease objects instead of copies.
+
+    No per-frame allocation or memcpy is made; each lease keeps its Gst.Buffer
+    mapped until released. Use `with lease:` to release it as soon as you are
+    done. Any lease still held when the generator advances is released for you,
+    so at most one frame is borrowed at a time.
+
+        for lease in iter_frame_leases(url):
+            with lease:
+                process(lease.frame)   # read-only view, valid inside the block
+
+    Yields:
+        FrameLease: read-only BGR view (H, W, 3) plus the frame's PTS.
+    """
+    fmt = (options or PipelineOptions()).format
+    pipeline = _build_pipeline(rtsp_url, options=options)
+    _start(pipeline, startup)
+    sink = pipeline.get_by_name("sink")
+    dims: list = [None, None]
+    lease = None
+
+    try:
+        while True:
+            lease, pts_ns = _pull_lease(sink, dims, fmt)
+            if lease is None:
+                if pts_ns == Gst.CLOCK_TIME_NONE:
+                    break
+                continue
+            yield lease
+            lease.release()
+    finally:
+        if lease is not None:
+            lease.release()
         pipeline.set_state(Gst.State.NULL)
 
 
 def iter_frames_timed(
     rtsp_url: str,
+    options: PipelineOptions | None = None,
+    startup: StartupTiming | None = None,
 ) -> Generator[tuple[np.ndarray, FrameTiming], None, None]:
     """
     Like iter_frames, but yields (frame, FrameTiming) pairs.
@@ -150,15 +582,16 @@ def iter_frames_timed(
     Yields:
         (numpy.ndarray, FrameTiming): BGR frame and its timing metadata.
     """
-    pipeline = _build_pipeline(rtsp_url)
-    pipeline.set_state(Gst.State.PLAYING)
+    fmt = (options or PipelineOptions()).format
+    pipeline = _build_pipeline(rtsp_url, options=options)
+    _start(pipeline, startup)
     sink = pipeline.get_by_name("sink")
     dims: list = [None, None]
     stream_opened_at = time.time()
 
     try:
         while True:
-            frame, pts_ns = _pull_bgr(sink, dims)
+            frame, pts_ns = _pull_bgr(sink, dims, fmt)
             received_at = time.time()
             if frame is None:
                 if pts_ns == Gst.CLOCK_TIME_NONE:
@@ -174,31 +607,154 @@ def iter_frames_timed(
         pipeline.set_state(Gst.State.NULL)
 
 
-def _ntp_capture_unix(
-    buf: Gst.Buffer,
-    pts_ns: int,
-    pipeline: Gst.Pipeline,
-    ntp_caps: "Gst.Caps",
-    ntp_unix_delta: int,
-) -> float | None:
-    """Return Unix capture timestamp from NTP metadata, or None if not yet available."""
-    try:
-        meta = buf.get_reference_timestamp_meta(ntp_caps)
-        if meta is not None:
-            return meta.timestamp / _NS - ntp_unix_delta
-    except Exception:
-        pass
-    if pts_ns not in (0, Gst.CLOCK_TIME_NONE):
-        base_time = pipeline.get_base_time()
-        if base_time not in (0, Gst.CLOCK_TIME_NONE):
-            candidate = (pts_ns + base_time) / _NS
-            if candidate > 946_684_800:
-                return candidate
-    return None
+_NTP_UNIX_DELTA = 2_208_988_800  # seconds: NTP epoch (1900) → Unix epoch (1970)
+
+
+def _enable_ntp_meta(src: Gst.Element, clock: NtpClockModel | None = None) -> None:
+    """
+    Ask rtspsrc's rtpbin to NTP-sync and attach reference-timestamp meta to buffers.
+    If clock is given, it is told about every RTCP sender report so it can recalibrate.
+    """
+    def _on_new_manager(rtspsrc, manager):
+        for prop in ("ntp-sync", "add-reference-timestamp-meta"):
+            try:
+                manager.set_property(prop, True)
+            except Exception:
+                pass
+        if clock is not None:
+            manager.connect("on-ssrc-sr", lambda *_: clock.notify_sr())
+
+    src.connect("new-manager", _on_new_manager)
+
+
+class NtpClockModel:
+    """
+    Incremental PTS -> camera NTP (Unix) clock mapping for one stream.
+
+    Between RTCP sender reports the mapping is linear, so buffers are not
+    probed for reference-timestamp meta on every frame. Instead the model keeps
+    a few (pts, ntp) anchors — one per SR, read from the first buffer carrying
+    meta after the SR arrives — and converts every other PTS with an affine
+    transform fitted to them:
+
+        capture_unix = intercept + slope * pts_seconds
+
+    Until the first anchor, the NTP-synced pipeline clock (pts + base_time) is
+    used as a fallback, with base_time read once and cached.
+
+    Pass an instance to iter_frames_ntp / iter_rtp_ntp via `clock=` to read the
+    per-camera estimates while streaming:
+        skew_ppm:       camera clock rate relative to the local pipeline clock,
+                        in parts per million (0 = same rate).
+        drift_ms:       how far the camera clock has moved against the local
+                        clock since the first SR.
+        last_error_ms:  how far the model's prediction was off when the latest
+                        SR arrived (0 for the first one).
+
+    Args:
+        window: Number of recent SR anchors the fit uses.
+    """
+
+    _NTP_CAPS = Gst.Caps.from_string("timestamp/x-ntp")
+    _MIN_UNIX = 946_684_800  # 2000-01-01; smaller values mean the pipeline clock is not NTP yet
+
+    def __init__(self, window: int = 8):
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all anchors, e.g. when the stream is reconnected."""
+        self.slope = 1.0
+        self.intercept: float | None = None
+        self.sr_count = 0          # sender reports used as anchors
+        self.last_error_ms = 0.0
+        self._anchors: deque[tuple[float, float]] = deque(maxlen=self.window)
+        self._first_offset: float | None = None
+        self._sr_pending = True    # probe the next buffer for meta
+        self._base_time: int | None = None
+
+    def notify_sr(self) -> None:
+        """Called from rtpbin's on-ssrc-sr signal (streaming thread): recalibrate on the next buffer."""
+        self._sr_pending = True
+
+    @property
+    def calibrated(self) -> bool:
+        return self.intercept is not None
+
+    @property
+    def skew_ppm(self) -> float:
+        return (self.slope - 1.0) * 1e6
+
+    @property
+    def drift_ms(self) -> float:
+        if self._first_offset is None or not self._anchors:
+            return 0.0
+        pts_s, ntp_unix = self._anchors[-1]
+        return (ntp_unix - pts_s - self._first_offset) * 1000.0
+
+    def stats(self) -> dict:
+        return {
+            "sr_count": self.sr_count,
+            "skew_ppm": round(self.skew_ppm, 3),
+            "drift_ms": round(self.drift_ms, 3),
+            "last_error_ms": round(self.last_error_ms, 3),
+        }
+
+    def _add_anchor(self, pts_s: float, ntp_unix: float) -> None:
+        if self.calibrated:
+            self.last_error_ms = (self.intercept + self.slope * pts_s - ntp_unix) * 1000.0
+        if self._first_offset is None:
+            self._first_offset = ntp_unix - pts_s
+        self._anchors.append((pts_s, ntp_unix))
+        self.sr_count += 1
+
+        # Slope: least-squares fit over the window (relative to the oldest anchor,
+        # so large NTP values do not cost float precision). The line is pinned to
+        # the newest anchor, which reflects the latest SR exactly.
+        n = len(self._anchors)
+        if n >= 2:
+            x0, y0 = self._anchors[0]
+            xs = [x - x0 for x, _ in self._anchors]
+            ys = [y - y0 for _, y in self._anchors]
+            mean_x = sum(xs) / n
+            mean_y = sum(ys) / n
+            var_x = sum((x - mean_x) ** 2 for x in xs)
+            if var_x > 0:
+                self.slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+        self.intercept = ntp_unix - self.slope * pts_s
+
+    def capture_unix(self, buf: Gst.Buffer, pts_ns: int, pipeline: Gst.Pipeline) -> float | None:
+        """Return the Unix capture timestamp of buf, or None if no SR has been seen yet."""
+        if pts_ns == Gst.CLOCK_TIME_NONE:
+            return None
+        pts_s = pts_ns / _NS
+
+        if self._sr_pending:
+            meta = buf.get_reference_timestamp_meta(self._NTP_CAPS)
+            if meta is not None:
+                self._sr_pending = False
+                self._add_anchor(pts_s, meta.timestamp / _NS - _NTP_UNIX_DELTA)
+
+        if self.intercept is not None:
+            return self.intercept + self.slope * pts_s
+
+        if pts_ns == 0:
+            return None
+        if self._base_time is None:
+            base_time = pipeline.get_base_time()
+            if base_time in (0, Gst.CLOCK_TIME_NONE):
+                return None
+            self._base_time = base_time
+        candidate = (pts_ns + self._base_time) / _NS
+        return candidate if candidate > self._MIN_UNIX else None
 
 
 def iter_frames_ntp(
     rtsp_url: str,
+    options: PipelineOptions | None = None,
+    timeout: float | None = None,
+    startup: StartupTiming | None = None,
+    clock: NtpClockModel | None = None,
 ) -> Generator[tuple[np.ndarray, float | None, float], None, None]:
     """
     Yield (frame, capture_unix, received_at) using true NTP wall-clock time.
@@ -206,75 +762,673 @@ def iter_frames_ntp(
     Sets ntp-sync=True and add-reference-timestamp-meta=True on the internal
     rtpbin via the rtspsrc new-manager signal.
 
-    capture_unix is derived from GstReferenceTimestampMeta on the buffer when
-    available (most reliable), or falls back to (pts_ns + base_time) / 1e9
-    once GStreamer has NTP-calibrated the pipeline clock.
+    capture_unix comes from an NtpClockModel: GstReferenceTimestampMeta is read
+    once per RTCP SR and every frame in between is mapped from its PTS with an
+    affine transform. Before the first meta-carrying buffer it falls back to
+    (pts_ns + base_time) / 1e9 once GStreamer has NTP-calibrated the pipeline
+    clock. Pass clock= to read per-camera skew/drift estimates while streaming.
 
     capture_unix is None until the first RTCP SR arrives.
 
+    If timeout is set, iteration ends when no frame arrives for that many seconds
+    (including at startup) instead of blocking forever on a dead stream.
+
     Yields:
         (frame, capture_unix, received_at)
         - frame:        BGR numpy array (H, W, 3)
         - capture_unix: Unix timestamp of camera capture, or None if no SR yet.
         - received_at:  time.time() when the frame was decoded locally.
     """
-    _NTP_UNIX_DELTA = 2_208_988_800  # seconds: NTP epoch (1900) → Unix epoch (1970)
+    fmt = (options or PipelineOptions()).format
+    pipeline = _build_pipeline(rtsp_url, options=options)
+    clock = clock if clock is not None else NtpClockModel()
+    clock.reset()
+    _enable_ntp_meta(pipeline.get_by_name("src"), clock)
+    _start(pipeline, startup)
+    sink = pipeline.get_by_name("sink")
+    dims: list = [None, None]
+    timeout_ns = int(timeout * _NS) if timeout is not None else None
+
+    try:
+        while True:
+            sample = _pull_sample(sink, dims, timeout_ns)
+            if sample is None:
+                break
+
+            buf = sample.get_buffer()
+            pts_ns = buf.pts
+            received_at = time.time()
+
+            mi, view = _map_frame(buf, dims, fmt)
+            if mi is None:
+                continue
+            try:
+                frame = view.copy()
+            finally:
+                del view
+                buf.unmap(mi)
+
+            yield frame, clock.capture_unix(buf, pts_ns, pipeline), received_at
+    finally:
+        pipeline.set_state(Gst.State.NULL)
+
+
+def iter_rtp_ntp(
+    rtsp_url: str,
+    timeout: float | None = None,
+    startup: StartupTiming | None = None,
+    clock: NtpClockModel | None = None,
+) -> Generator[tuple[float | None, float], None, None]:
+    """
+    Yield (capture_unix, received_at) per video access unit without decoding.
 
+    A latency probe for surveys: the pipeline is just rtspsrc ! appsink, so no
+    depayloading, decodebin or videoconvert runs and a stream costs a small
+    fraction of a core. NTP timestamps come from the same reference-timestamp
+    meta (via an NtpClockModel) as iter_frames_ntp, read from the RTP packet that
+    carries the marker bit, i.e. the last packet of each frame.
+
+    Note that received_at is the arrival of the frame's last packet, so
+    latencies exclude decode time and run a few ms lower than iter_frames_ntp.
+
+    Yields:
+        (capture_unix, received_at) — capture_unix is None until the first RTCP SR.
+    """
     desc = (
         f'rtspsrc name=src location="{rtsp_url}" protocols=tcp latency=0 '
-        f'! decodebin ! videoconvert ! video/x-raw,format=BGR '
+        f'! application/x-rtp,media=video '
         f'! appsink name=sink emit-signals=false sync=false'
     )
     pipeline = Gst.parse_launch(desc)
-    src = pipeline.get_by_name("src")
-    _ntp_caps = Gst.Caps.from_string("timestamp/x-ntp")
-
-    def _on_new_manager(rtspsrc, manager):
-        for prop in ("ntp-sync", "add-reference-timestamp-meta"):
-            try:
-                manager.set_property(prop, True)
-            except Exception:
-                pass
-
-    src.connect("new-manager", _on_new_manager)
-    pipeline.set_state(Gst.State.PLAYING)
+    clock = clock if clock is not None else NtpClockModel()
+    clock.reset()
+    _enable_ntp_meta(pipeline.get_by_name("src"), clock)
+    _start(pipeline, startup)
     sink = pipeline.get_by_name("sink")
-    dims: list = [None, None]
 
     try:
         while True:
-            sample = sink.emit("pull-sample")
+            if timeout is None:
+                sample = sink.emit("pull-sample")
+            else:
+                sample = sink.emit("try-pull-sample", int(timeout * _NS))
             if sample is None:
                 break
 
             buf = sample.get_buffer()
-            pts_ns = buf.pts
             received_at = time.time()
+            header = buf.extract_dup(0, 2)
+            if len(header) < 2 or not header[1] & 0x80:  # RTP marker bit: last packet of the frame
+                continue
+            yield clock.capture_unix(buf, buf.pts, pipeline), received_at
+    finally:
+        pipeline.set_state(Gst.State.NULL)
 
-            if dims[0] is None:
-                s = sample.get_caps().get_structure(0)
-                dims[0] = s.get_value("width")
-                dims[1] = s.get_value("height")
 
-            try:
-                ok, mi = buf.map(Gst.MapFlags.READ)
-            except (ValueError, TypeError):
+# ---------------------------------------------------------------------------
+# Recorded clips
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RecordedClip:
+    """A recorded clip to decode: a URL playable by uridecodebin plus its start time."""
+    url: str
+    start_unix: float = 0.0     # capture time of the clip's first frame
+    camera_id: str = ""
+    headers: dict[str, str] = field(default_factory=dict)  # extra HTTP headers, e.g. Authorization
+
+
+def clips_from_media(results: list[dict], access_token: str, prefer: str = "mp4Url") -> list[RecordedClip]:
+    """
+    Build RecordedClips from /media results (see api.get_recorded_clips).
+
+    prefer picks mp4Url (HTTPS download, authorized with a Bearer header) or
+    rtspUrl (authorized with an access_token query parameter); the other URL is
+    used when the preferred one is missing.
+    """
+    from api import with_access_token
+
+    clips = []
+    for item in results:
+        url = item.get(prefer) or item.get("rtspUrl") or item.get("mp4Url")
+        if not url:
+            continue
+        start = datetime.fromisoformat(item["startTimestamp"].replace("Z", "+00:00")).timestamp()
+        if url.startswith("rtsp"):
+            clips.append(RecordedClip(with_access_token(url, access_token), start, item.get("deviceId", "")))
+        else:
+            clips.append(RecordedClip(url, start, item.get("deviceId", ""),
+                                      {"Authorization": f"Bearer {access_token}"}))
+    return clips
+
+
+def _iter_clip(
+    clip: RecordedClip,
+    every_n: int | None,
+    every_seconds: float | None,
+    options: PipelineOptions | None,
+) -> Generator[tuple[float, np.ndarray], None, None]:
+    """Decode one clip as fast as possible; yield (capture_unix, frame) for the frames the stride keeps."""
+    opts = options or PipelineOptions()
+    # Expose only the video stream, so an audio pad can never be the one linked to identity.
+    pipeline = Gst.parse_launch(" ! ".join(
+        [f'uridecodebin name=src uri="{clip.url}" caps=video/x-raw expose-all-streams=false',
+         "identity name=stride", *_raw_video_tail(opts)]))
+    sink = pipeline.get_by_name("sink")
+    sink.set_property("max-buffers", 4)  # back-pressure: decode no faster than the frames are taken
+
+    if clip.headers:
+        def on_source_setup(_bin, source):
+            if source.find_property("extra-headers") is not None:
+                headers = Gst.Structure.new_empty("extra-headers")
+                for key, value in clip.headers.items():
+                    headers.set_value(key, value)
+                source.set_property("extra-headers", headers)
+        pipeline.get_by_name("src").connect("source-setup", on_source_setup)
+
+    # Drop unwanted frames right after the decoder, before any scaling or conversion.
+    stride = {"count": 0, "first_pts": None, "last_kept": None}
+    interval_ns = int(every_seconds * _NS) if every_seconds else 0
+
+    def stride_probe(pad, info):
+        pts = info.get_buffer().pts
+        if stride["first_pts"] is None:
+            stride["first_pts"] = pts
+        n = stride["count"]
+        stride["count"] += 1
+        if every_n and n % every_n:
+            return Gst.PadProbeReturn.DROP
+        if interval_ns and pts != Gst.CLOCK_TIME_NONE:
+            if stride["last_kept"] is not None and pts - stride["last_kept"] < interval_ns:
+                return Gst.PadProbeReturn.DROP
+            stride["last_kept"] = pts
+        return Gst.PadProbeReturn.OK
+
+    pipeline.get_by_name("stride").get_static_pad("sink").add_probe(Gst.PadProbeType.BUFFER, stride_probe)
+    pipeline.set_state(Gst.State.PLAYING)
+    bus = pipeline.get_bus()
+    dims: list = [None, None]
+
+    try:
+        while True:
+            sample = _pull_sample(sink, dims, _NS // 2)
+            if sample is None:
+                msg = bus.pop_filtered(Gst.MessageType.ERROR)
+                if msg is not None:
+                    err, _ = msg.parse_error()
+                    raise RuntimeError(err.message)
+                if sink.is_eos():
+                    return
                 continue
-            if not ok:
+
+            buf = sample.get_buffer()
+            mi, view = _map_frame(buf, dims, opts.format)
+            if mi is None:
                 continue
             try:
-                frame = np.frombuffer(mi.data, np.uint8).reshape((dims[1], dims[0], 3)).copy()
-            except (ValueError, TypeError):
-                frame = None
+                frame = view.copy()
             finally:
+                del view
                 buf.unmap(mi)
+            offset_ns = buf.pts - stride["first_pts"] if buf.pts != Gst.CLOCK_TIME_NONE else 0
+            yield clip.start_unix + offset_ns / _NS, frame
+    finally:
+        pipeline.set_state(Gst.State.NULL)
 
-            if frame is None:
-                continue
 
-            yield frame, _ntp_capture_unix(buf, pts_ns, pipeline, _ntp_caps, _NTP_UNIX_DELTA), received_at
+# Result queue and stop flag of a clip-decoding worker process, set by _init_clip_worker.
+_clip_results = None
+_clip_stop = None
+
+
+def _init_clip_worker(results, stop) -> None:
+    global _clip_results, _clip_stop
+    _clip_results = results
+    _clip_stop = stop
+    # Workers only exit at shutdown, when the parent has stopped reading; don't
+    # block that exit flushing frames nobody will take.
+    results.cancel_join_thread()
+
+
+def _put_clip_result(message: tuple) -> bool:
+    """Queue message for the parent; False if the parent stopped listening first."""
+    while not _clip_stop.is_set():
+        try:
+            _clip_results.put(message, timeout=0.5)
+            return True
+        except queue_module.Full:
+            continue
+    return False
+
+
+def _decode_clip(job: tuple) -> None:
+    """Worker-process entry point: stream one clip's frames to the parent, then a "done" message."""
+    index, clip, every_n, every_seconds, options = job
+    try:
+        for capture_unix, frame in _iter_clip(clip, every_n, every_seconds, options):
+            if not _put_clip_result(("frame", index, capture_unix, frame)):
+                return
+    except Exception as e:
+        _put_clip_result(("done", index, None, str(e)))
+    else:
+        _put_clip_result(("done", index, None, None))
+
+
+def iter_clip_frames(
+    clips: list[RecordedClip | str],
+    every_n: int | None = None,
+    every_seconds: float | None = None,
+    options: PipelineOptions | None = None,
+    workers: int | None = None,
+    queue_size: int = 32,
+) -> Generator[tuple[RecordedClip, float, np.ndarray], None, None]:
+    """
+    Decode recorded clips in parallel, faster than real time, across a process pool.
+
+    Each clip is decoded in its own worker process (spawned, so GStreamer state
+    is never forked) with appsink sync=false, so throughput is bounded by CPU
+    rather than by the clip's duration. Frames from different clips interleave
+    in arrival order; frames of one clip stay in order. Clips that fail are
+    reported and skipped; a crashed worker process (plugin segfault, OOM)
+    breaks the pool, so every clip not yet finished is reported as failed.
+
+        results = api.get_recorded_clips(camera_id, start, end)
+        clips = clips_from_media(results, auth.get_valid_access_token())
+        for clip, capture_unix, frame in iter_clip_frames(clips, every_seconds=1.0):
+            ...
+
+    Args:
+        clips:         RecordedClips (or bare URLs, which get start_unix 0).
+        every_n:       Keep only every Nth decoded frame of each clip.
+        every_seconds: Keep at most one frame per this many seconds of footage.
+        options:       Optional PipelineOptions (downscale, output format...).
+                       keyframes_only is not applied to clips.
+        workers:       Worker processes. Defaults to min(len(clips), CPU count).
+        queue_size:    Frames in flight between the workers and the caller.
+
+    Yields:
+        (clip, capture_unix, frame) — capture_unix is clip.start_unix plus the
+        frame's offset into the clip.
+    """
+    clips = [c if isinstance(c, RecordedClip) else RecordedClip(c) for c in clips]
+    if not clips:
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue(maxsize=queue_size)
+    stop = ctx.Event()
+    # Unlike multiprocessing.Pool, which silently replaces a crashed worker and
+    # loses its task, the executor fails the task with BrokenProcessPool.
+    executor = ProcessPoolExecutor(
+        max_workers=workers or min(len(clips), os.cpu_count() or 1),
+        mp_context=ctx,
+        initializer=_init_clip_worker,
+        initargs=(results, stop),
+    )
+    futures = {
+        executor.submit(_decode_clip, (i, clip, every_n, every_seconds, options)): i
+        for i, clip in enumerate(clips)
+    }
+    finished: set[int] = set()
+
+    def report(index: int, error) -> None:
+        finished.add(index)
+        if error is not None:
+            clip = clips[index]
+            print(f"[{clip.camera_id or clip.url}] clip failed: {error}")
+
+    try:
+        while len(finished) < len(clips):
+            try:
+                kind, index, capture_unix, payload = results.get(timeout=1.0)
+            except queue_module.Empty:
+                # A worker that died (segfault, OOM) never sends "done"; its future carries the error.
+                for future, index in futures.items():
+                    if index not in finished and future.done() and future.exception() is not None:
+                        report(index, future.exception())
+                continue
+            if kind == "done":
+                if index not in finished:
+                    report(index, payload)
+                continue
+            yield clips[index], capture_unix, payload
     finally:
-        pipeline.set_state(Gst.State.NULL)
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Reconnecting frame source
+# ---------------------------------------------------------------------------
+
+class ResilientFrameSource:
+    """
+    Frame iterator that survives RTSP session drops.
+
+    When the bus reports an error or EOS, or no frame arrives for stall_timeout
+    seconds, the pipeline is torn down, the URL is re-resolved through
+    url_factory (which should mint a URL with a fresh token) and the pipeline
+    is restarted after a jittered exponential backoff. Frames keep coming out of
+    the same iterator.
+
+    While iterating, the source subscribes to auth token refreshes and re-keys
+    the session with the new token (pair it with auth.start_background_refresh()
+    so the refresh happens before the old token expires). The subscription is
+    dropped when the iterator is closed.
+
+        auth.start_background_refresh()
+        source = ResilientFrameSource(lambda: api.get_live_stream(camera_id))
+        for frame in source:
+            ...
+
+    Args:
+        url_factory:     Callable returning a current RTSP URL (with access_token).
+        options:         Optional PipelineOptions for every (re)connect.
+        stall_timeout:   Seconds without a frame before the stream is considered dead.
+        backoff_initial: First reconnect delay ceiling, in seconds.
+        backoff_max:     Upper bound on the reconnect delay ceiling.
+        max_reconnects:  Give up (end iteration) after this many consecutive failures. None = never.
+        reconnect_on_refresh: Reconnect with a fresh URL whenever auth refreshes the token.
+    """
+
+    _POLL_NS = _NS // 2  # how often the pull loop checks the bus and the stall timer
+
+    def __init__(
+        self,
+        url_factory: Callable[[], str],
+        options: PipelineOptions | None = None,
+        stall_timeout: float = 10.0,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30.0,
+        max_reconnects: int | None = None,
+        reconnect_on_refresh: bool = True,
+    ):
+        self.url_factory = url_factory
+        self.options = options
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_reconnects = max_reconnects
+        self.reconnect_on_refresh = reconnect_on_refresh
+        self.reconnects = 0           # total reconnects since start
+        self.outage_seconds = 0.0     # total time spent without frames between sessions
+        self.last_error: str | None = None
+        self.startup: StartupTiming | None = None  # milestones of the current session
+        self._reconnect_requested = threading.Event()
+
+    def request_reconnect(self) -> None:
+        """Restart the session at the next opportunity, e.g. after a token refresh. Thread-safe."""
+        self._reconnect_requested.set()
+
+    def _on_token_refresh(self, _access_token: str) -> None:
+        self.request_reconnect()
+
+    def stats(self) -> dict:
+        return {
+            "reconnects": self.reconnects,
+            "outage_seconds": self.outage_seconds,
+            "last_error": self.last_error,
+        }
+
+    def _session(self, rtsp_url: str) -> Generator[np.ndarray, None, None]:
+        """Yield frames from one pipeline until it fails, stalls or a reconnect is requested."""
+        fmt = (self.options or PipelineOptions()).format
+        pipeline = _build_pipeline(rtsp_url, options=self.options)
+        self.startup = StartupTiming()
+        _start(pipeline, self.startup)
+        sink = pipeline.get_by_name("sink")
+        bus = pipeline.get_bus()
+        dims: list = [None, None]
+        last_frame_at = time.monotonic()
+
+        try:
+            while not self._reconnect_requested.is_set():
+                msg = bus.pop_filtered(Gst.MessageType.ERROR | Gst.MessageType.EOS)
+                if msg is not None:
+                    if msg.type == Gst.MessageType.ERROR:
+                        err, _ = msg.parse_error()
+                        self.last_error = err.message
+                    else:
+                        self.last_error = "end of stream"
+                    return
+
+                sample = _pull_sample(sink, dims, self._POLL_NS)
+                if sample is None:
+                    if sink.is_eos():
+                        self.last_error = "end of stream"
+                        return
+                    if time.monotonic() - last_frame_at > self.stall_timeout:
+                        self.last_error = f"no frames for {self.stall_timeout:.0f}s"
+                        return
+                    continue
+
+                buf = sample.get_buffer()
+                mi, view = _map_frame(buf, dims, fmt)
+                if mi is None:
+                    continue
+                try:
+                    frame = view.copy()
+                finally:
+                    del view
+                    buf.unmap(mi)
+                last_frame_at = time.monotonic()
+                yield frame
+        finally:
+            pipeline.set_state(Gst.State.NULL)
+
+    def __iter__(self) -> Generator[np.ndarray, None, None]:
+        if not self.reconnect_on_refresh:
+            yield from self._iter_sessions()
+            return
+
+        import auth
+
+        callback = self._on_token_refresh
+        auth.subscribe(callback)
+        try:
+            yield from self._iter_sessions()
+        finally:
+            auth.unsubscribe(callback)
+
+    def _iter_sessions(self) -> Generator[np.ndarray, None, None]:
+        failures = 0
+        outage_started: float | None = None
+
+        while True:
+            self._reconnect_requested.clear()
+            try:
+                rtsp_url = self.url_factory()
+            except Exception as e:
+                self.last_error = f"could not resolve stream URL: {e}"
+            else:
+                for frame in self._session(rtsp_url):
+                    if outage_started is not None:
+                        self.outage_seconds += time.monotonic() - outage_started
+                        outage_started = None
+                    failures = 0
+                    yield frame
+
+            if outage_started is None:
+                outage_started = time.monotonic()
+            if self._reconnect_requested.is_set():
+                print("Reconnecting stream (requested)...")
+                delay = 0.0
+            else:
+                failures += 1
+                if self.max_reconnects is not None and failures > self.max_reconnects:
+                    print(f"Giving up after {self.max_reconnects} reconnect attempts: {self.last_error}")
+                    return
+                # Full jitter: uniform in [0, min(max, initial * 2^n)).
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_initial * 2 ** (failures - 1)))
+                print(f"Stream lost ({self.last_error}); reconnecting in {delay:.1f}s...")
+            self.reconnects += 1
+            time.sleep(delay)
+
+
+# ---------------------------------------------------------------------------
+# Multi-camera multiplexer
+# ---------------------------------------------------------------------------
+
+_main_loop: GLib.MainLoop | None = None
+_main_loop_lock = threading.Lock()
+
+
+def _ensure_main_loop() -> None:
+    """Run the default GLib main loop on a daemon thread (once per process)."""
+    global _main_loop
+    with _main_loop_lock:
+        if _main_loop is None:
+            _main_loop = GLib.MainLoop()
+            threading.Thread(target=_main_loop.run, name="een-glib-loop", daemon=True).start()
+
+
+@dataclass
+class _MuxStream:
+    camera_id: str
+    pipeline: Gst.Pipeline
+    fmt: str
+    frames: deque
+    dims: list = field(default_factory=lambda: [None, None])
+    opened_at: float = 0.0
+    received: int = 0
+    dropped: int = 0
+    ended: bool = False
+
+
+class FrameMultiplexer:
+    """
+    Decode many RTSP streams in one process without a Python thread per camera.
+
+    Each camera gets its own pipeline, but all of them share the process-wide
+    GLib main loop (for bus messages) and deliver frames through appsink "new-sample"
+    callbacks into small per-camera queues. When a consumer falls behind, the
+    oldest frame of that camera is dropped, so one slow or bursty camera never
+    delays the others.
+
+        with FrameMultiplexer(queue_size=2) as mux:
+            for camera_id, url in api.get_live_streams(ids).items():
+                mux.add(camera_id, url)
+            for camera_id, frame, timing in mux:
+                ...
+
+    Iteration ends when every stream has ended or close() is called.
+    """
+
+    def __init__(self, queue_size: int = 2, options: PipelineOptions | None = None):
+        self.queue_size = queue_size
+        self.options = options
+        self._streams: dict[str, _MuxStream] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._rr = 0  # round-robin position for fair delivery
+        _ensure_main_loop()
+
+    def add(self, camera_id: str, rtsp_url: str, options: PipelineOptions | None = None) -> None:
+        """Start decoding camera_id. Replaces an existing stream with the same ID."""
+        self.remove(camera_id)
+        opts = options or self.options or PipelineOptions()
+        pipeline = _build_pipeline(rtsp_url, options=opts)
+        stream = _MuxStream(camera_id, pipeline, opts.format, deque(maxlen=self.queue_size))
+
+        sink = pipeline.get_by_name("sink")
+        sink.set_property("emit-signals", True)
+        sink.connect("new-sample", self._on_new_sample, stream)
+
+        pipeline.get_bus().add_watch(GLib.PRIORITY_DEFAULT, self._on_bus_message, stream)
+
+        with self._cond:
+            self._streams[camera_id] = stream
+        stream.opened_at = time.time()
+        pipeline.set_state(Gst.State.PLAYING)
+
+    def remove(self, camera_id: str) -> None:
+        """Stop decoding camera_id and discard its queued frames."""
+        with self._cond:
+            stream = self._streams.pop(camera_id, None)
+            self._cond.notify_all()
+        if stream is not None:
+            stream.ended = True
+            stream.pipeline.get_bus().remove_watch()
+            stream.pipeline.set_state(Gst.State.NULL)
+
+    def _on_new_sample(self, sink: Gst.Element, stream: _MuxStream) -> Gst.FlowReturn:
+        # Runs on the pipeline's streaming thread.
+        frame, pts_ns = _pull_bgr(sink, stream.dims, stream.fmt)
+        if frame is None:
+            return Gst.FlowReturn.OK if pts_ns != Gst.CLOCK_TIME_NONE else Gst.FlowReturn.EOS
+        timing = FrameTiming(
+            stream_pos_ms=pts_ns / 1e6 if pts_ns != Gst.CLOCK_TIME_NONE else 0.0,
+            received_at=time.time(),
+            stream_opened_at=stream.opened_at,
+        )
+        with self._cond:
+            if len(stream.frames) == stream.frames.maxlen:
+                stream.dropped += 1
+            stream.frames.append((frame, timing))
+            stream.received += 1
+            self._cond.notify()
+        return Gst.FlowReturn.OK
+
+    def _on_bus_message(self, bus: Gst.Bus, message: Gst.Message, stream: _MuxStream) -> bool:
+        # Runs on the shared main loop thread.
+        if message.type == Gst.MessageType.ERROR:
+            err, _ = message.parse_error()
+            print(f"[{stream.camera_id}] stream error: {err.message}")
+        elif message.type != Gst.MessageType.EOS:
+            return True
+        with self._cond:
+            stream.ended = True
+            self._cond.notify_all()
+        return False
+
+    def stats(self) -> dict[str, dict]:
+        """Per-camera counters: frames received, frames dropped, current queue depth."""
+        with self._cond:
+            return {
+                cid: {"received": st.received, "dropped": st.dropped, "queued": len(st.frames), "ended": st.ended}
+                for cid, st in self._streams.items()
+            }
+
+    def _next_ready(self) -> tuple[str, np.ndarray, FrameTiming] | None:
+        """Pop the next frame in round-robin camera order. Caller holds _cond."""
+        streams = list(self._streams.values())
+        for i in range(len(streams)):
+            stream = streams[(self._rr + i) % len(streams)]
+            if stream.frames:
+                self._rr = (self._rr + i + 1) % len(streams)
+                frame, timing = stream.frames.popleft()
+                return stream.camera_id, frame, timing
+        return None
+
+    def __iter__(self) -> Generator[tuple[str, np.ndarray, FrameTiming], None, None]:
+        while True:
+            with self._cond:
+                item = self._next_ready()
+                while item is None:
+                    if self._closed or all(st.ended for st in self._streams.values()):
+                        return
+                    self._cond.wait()
+                    item = self._next_ready()
+            yield item
+
+    def close(self) -> None:
+        """
+        Stop every pipeline and end iteration. Safe to call more than once.
+
+        The process-wide GLib main loop keeps running; it is shared with any
+        other multiplexer or stream in the process.
+        """
+        for camera_id in list(self._streams):
+            self.remove(camera_id)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __enter__(self) -> FrameMultiplexer:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 def display(rtsp_url: str, window_title: str = "EEN Live Stream") -> None:
@@ -286,17 +1440,95 @@ def display(rtsp_url: str, window_title: str = "EEN Live Stream") -> None:
         window_title: Title of the display window.
     """
     print("Press 'q' in the window to quit.")
-    for frame in iter_frames(rtsp_url):
+    # Decode on a background thread and always show the newest frame, so a
+    # slow imshow/waitKey never lets latency build up.
+    queue = FrameQueue(maxsize=1, policy="drop-oldest")
+    for frame in iter_frames(rtsp_url, queue=queue):
         cv2.imshow(window_title, frame)
         if cv2.waitKey(1) & 0xFF == ord("q"):
             break
     cv2.destroyAllWindows()
+    stats = queue.stats()
+    if stats["dropped"]:
+        print(f"Displayed {stats['delivered']} frames; skipped {stats['dropped']} to stay live.")
+
+
+def grab_jpeg(
+    rtsp_url: str,
+    quality: int = 85,
+    timeout: float = 15.0,
+    startup: StartupTiming | None = None,
+) -> bytes:
+    """
+    Return a JPEG of the stream's first keyframe, decoding nothing else.
+
+    Delta frames are dropped before the decoder (parsebin ! identity
+    drop-buffer-flags=delta-unit), so the image is never a mid-GOP smear. The
+    keyframe is encoded inside the pipeline by jpegenc snapshot=true, with no
+    numpy round trip, and the RTSP session is closed as soon as the JPEG exists.
+
+    Args:
+        rtsp_url: Full RTSP URL (including access_token param).
+        quality:  JPEG quality, 0-100.
+        timeout:  Seconds to wait for the keyframe before giving up.
+        startup:  Optional StartupTiming; first_frame_ms marks the finished JPEG.
+
+    Raises:
+        RuntimeError if the stream fails or no keyframe arrives within timeout.
+    """
+    desc = (
+        f'rtspsrc name=src location="{rtsp_url}" protocols=tcp latency=0 '
+        f'! parsebin ! identity name=keyframes drop-buffer-flags=delta-unit '
+        f'! decodebin ! videoconvert ! jpegenc snapshot=true quality={quality} '
+        f'! appsink name=sink emit-signals=false sync=false'
+    )
+    pipeline = Gst.parse_launch(desc)
+    sent = False
+
+    def first_keyframe(pad, info):
+        nonlocal sent
+        if sent:
+            return Gst.PadProbeReturn.DROP
+        sent = True
+        # Hand the keyframe downstream ourselves, then EOS right behind it on
+        # this streaming thread (EOS is serialized with buffers). The EOS
+        # drains the decoder, so a frame-threaded decoder emits the frame now
+        # instead of after several more keyframes.
+        peer = pad.get_peer()
+        peer.chain(info.get_buffer())
+        peer.send_event(Gst.Event.new_eos())
+        return Gst.PadProbeReturn.DROP
+
+    pipeline.get_by_name("keyframes").get_static_pad("src").add_probe(Gst.PadProbeType.BUFFER, first_keyframe)
+    _start(pipeline, startup)
+    sink = pipeline.get_by_name("sink")
+    bus = pipeline.get_bus()
+    deadline = time.monotonic() + timeout
+
+    try:
+        while time.monotonic() < deadline:
+            sample = sink.emit("try-pull-sample", _NS // 10)
+            if sample is not None:
+                buf = sample.get_buffer()
+                return buf.extract_dup(0, buf.get_size())
+            msg = bus.pop_filtered(Gst.MessageType.ERROR)
+            if msg is not None:
+                err, _ = msg.parse_error()
+                raise RuntimeError(f"Snapshot failed: {err.message}")
+            if sink.is_eos():
+                break
+        raise RuntimeError(f"No keyframe received within {timeout:.0f}s.")
+    finally:
+        pipeline.set_state(Gst.State.NULL)
 
 
 def save_snapshot(rtsp_url: str, output_path: str = "snapshot.jpg") -> str:
     """
     Grab a single frame from the stream and save it as an image file.
 
+    JPEG paths use grab_jpeg (first keyframe, encoded in-pipeline); other
+    formats decode a frame and write it with cv2.imwrite.
+
     Args:
         rtsp_url:    Full RTSP URL (including access_token param).
         output_path: File path to write (JPEG, PNG, etc. — inferred from extension).
@@ -304,6 +1536,13 @@ def save_snapshot(rtsp_url: str, output_path: str = "snapshot.jpg") -> str:
     Returns:
         The output_path that was written.
     """
+    if output_path.lower().endswith((".jpg", ".jpeg")):
+        data = grab_jpeg(rtsp_url)
+        with open(output_path, "wb") as f:
+            f.write(data)
+        print(f"Snapshot saved to {output_path}")
+        return output_path
+
     for frame in iter_frames(rtsp_url):
         cv2.imwrite(output_path, frame)
         print(f"Snapshot saved to {output_path}")
@@ -0,0 +1,175 @@
+"""
+Shared keep-alive HTTPS connection pool.
+Reuses TCP + TLS connections per host for api.py and auth.py requests.
+"""
+import gzip
+import http.client
+import io
+import threading
+import time
+import urllib.error
+import urllib.parse
+import zlib
+from collections import deque
+
+import config
+
+
+# Errors raised when a pooled keep-alive connection was closed by the server
+# while idle. Usually the request never reached the server, but that cannot be
+# told apart from a server that dropped the connection after acting on it, so
+# only idempotent methods are resent on a fresh connection.
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent HTTPS connections, keyed by (host, port).
+
+    Args:
+        max_size:     Maximum idle connections kept per host.
+        idle_timeout: Seconds an idle connection may sit in the pool before it is discarded.
+        timeout:      Socket timeout (seconds) for new connections.
+    """
+
+    def __init__(self, max_size: int = 4, idle_timeout: float = 60.0, timeout: float = 30.0):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: dict[tuple[str, int], deque] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "connections_expired": 0,
+        }
+
+    def _acquire(self, host: str, port: int) -> tuple[http.client.HTTPSConnection, bool]:
+        """Return (connection, reused). Expired idle connections are closed on the way."""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get((host, port))
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used <= self.idle_timeout:
+                    self._stats["connections_reused"] += 1
+                    return conn, True
+                self._stats["connections_expired"] += 1
+                conn.close()
+            self._stats["connections_opened"] += 1
+        return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, host: str, port: int, conn: http.client.HTTPSConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault((host, port), deque())
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        body: bytes | None = None,
+    ) -> bytes:
+        """
+        Send a request over a pooled connection and return the decoded response body.
+
+        gzip/deflate responses are decompressed transparently.
+        Raises urllib.error.HTTPError on non-2xx responses and urllib.error.URLError
+        on connection failures, matching urllib.request.urlopen.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "https":
+            raise ValueError(f"Only https URLs are supported: {url}")
+        host = parts.hostname
+        port = parts.port or 443
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        headers = dict(headers or {})
+        headers.setdefault("Accept-Encoding", "gzip, deflate")
+
+        with self._lock:
+            self._stats["requests"] += 1
+
+        conn, reused = self._acquire(host, port)
+        try:
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                if not reused or method.upper() not in _IDEMPOTENT_METHODS:
+                    raise
+                conn.close()
+                conn = http.client.HTTPSConnection(host, port, timeout=self.timeout)
+                with self._lock:
+                    self._stats["connections_opened"] += 1
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+            data = resp.read()
+        except OSError as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+        except http.client.HTTPException as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(host, port, conn)
+
+        encoding = resp.getheader("Content-Encoding", "").lower()
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        elif encoding == "deflate":
+            data = zlib.decompress(data)
+
+        if not 200 <= resp.status < 300:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(data))
+        return data
+
+    def stats(self) -> dict:
+        """Return a snapshot of the request and connection reuse counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["idle_connections"] = sum(len(q) for q in self._idle.values())
+        return snapshot
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            for idle in self._idle.values():
+                while idle:
+                    conn, _ = idle.pop()
+                    conn.close()
+            self._idle.clear()
+
+
+_pool = ConnectionPool(
+    max_size=config.HTTP_POOL_SIZE,
+    idle_timeout=config.HTTP_POOL_IDLE_TIMEOUT,
+    timeout=config.HTTP_TIMEOUT,
+)
+
+
+def request(method: str, url: str, headers: dict | None = None, body: bytes | None = None) -> bytes:
+    """Send a request through the shared process-wide pool."""
+    return _pool.request(method, url, headers=headers, body=body)
+
+
+def stats() -> dict:
+    """Connection reuse counters for the shared pool."""
+    return _pool.stats()
+
+
+def ensure_capacity(max_size: int) -> None:
+    """Grow the shared pool so it can keep at least max_size idle connections per host."""
+    with _pool._lock:
+        _pool.max_size = max(_pool.max_size, max_size)
@@ -0,0 +1,187 @@
+"""
+Constant-memory streaming statistics for frame latency measurements.
+
+Feeds on (capture_unix, received_at) pairs from frames_gst.iter_frames_ntp and
+keeps online percentiles, jitter, inter-frame gaps and dropped-frame counts
+without storing individual samples, so a 24-hour soak test stays bounded in memory.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+
+
+class LogHistogram:
+    """
+    HDR-style histogram with logarithmic buckets.
+
+    Every recorded value lands in a bucket whose width is `precision` (relative)
+    of its lower bound, so percentiles are accurate to about that fraction while
+    memory stays fixed (~2,000 buckets for the defaults). Values below min_value
+    share the first bucket; values above max_value share the last one.
+    Negative values are clamped to zero and counted in `below_zero`.
+    """
+
+    def __init__(self, min_value: float = 0.01, max_value: float = 3_600_000.0, precision: float = 0.01):
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_base = math.log1p(precision)
+        self._counts = [0] * (self._index(max_value) + 2)
+        self.reset()
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        """Representative (midpoint) value of a bucket."""
+        if index == 0:
+            return self.min_value
+        lower = self.min_value * math.exp((index - 1) * self._log_base)
+        return lower * (1 + math.expm1(self._log_base) / 2)
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.below_zero = 0
+
+    def record(self, value: float) -> None:
+        if value < 0:
+            self.below_zero += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._counts[min(self._index(max(value, 0.0)), len(self._counts) - 1)] += 1
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q: float) -> float | None:
+        """Value at quantile q (0-100), or None if empty. Clamped to the observed min/max."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+
+class LatencyStats:
+    """
+    Online latency, jitter, gap and drop statistics for one stream.
+
+    Args:
+        expected_fps: Nominal frame rate. If None, the frame interval is taken
+                      from the median observed inter-frame gap.
+        drop_factor:  A gap longer than drop_factor x the frame interval counts
+                      the missing frames as dropped.
+    """
+
+    def __init__(self, expected_fps: float | None = None, drop_factor: float = 1.5):
+        self.expected_fps = expected_fps
+        self.drop_factor = drop_factor
+        self.latency_ms = LogHistogram()
+        self.gap_ms = LogHistogram()
+        self.reset()
+
+    def reset(self) -> None:
+        self.latency_ms.reset()
+        self.gap_ms.reset()
+        self.jitter_ms = 0.0     # RFC 3550 interarrival jitter estimate
+        self.dropped = 0         # frames missing according to capture-time gaps
+        self.out_of_order = 0    # frames whose capture time did not advance
+        self._prev: tuple[float, float] | None = None
+
+    def _frame_interval_ms(self) -> float | None:
+        if self.expected_fps:
+            return 1000.0 / self.expected_fps
+        if self.gap_ms.count >= 10:
+            return self.gap_ms.percentile(50)
+        return None
+
+    def add(self, capture_unix: float, received_at: float) -> float:
+        """Record one frame; returns its latency in milliseconds."""
+        latency = (received_at - capture_unix) * 1000.0
+        self.latency_ms.record(latency)
+
+        if self._prev is not None:
+            prev_capture, prev_received = self._prev
+            gap = (capture_unix - prev_capture) * 1000.0
+            if gap <= 0:
+                self.out_of_order += 1
+            else:
+                interval = self._frame_interval_ms()
+                if interval and gap > self.drop_factor * interval:
+                    self.dropped += max(0, round(gap / interval) - 1)
+                self.gap_ms.record(gap)
+                # Transit time difference between consecutive frames (RFC 3550, section 6.4.1).
+                d = (received_at - prev_received) * 1000.0 - gap
+                self.jitter_ms += (abs(d) - self.jitter_ms) / 16.0
+        self._prev = (capture_unix, received_at)
+        return latency
+
+    def snapshot(self) -> dict:
+        """Current statistics as a flat dict (milliseconds), suitable for CSV/JSON."""
+        lat, gap = self.latency_ms, self.gap_ms
+
+        def rounded(value: float | None) -> float | None:
+            return round(value, 3) if value is not None and math.isfinite(value) else None
+
+        return {
+            "frames": lat.count,
+            "latency_min_ms": rounded(lat.min),
+            "latency_mean_ms": rounded(lat.mean),
+            "latency_p50_ms": rounded(lat.percentile(50)),
+            "latency_p95_ms": rounded(lat.percentile(95)),
+            "latency_p99_ms": rounded(lat.percentile(99)),
+            "latency_max_ms": rounded(lat.max),
+            "jitter_ms": rounded(self.jitter_ms),
+            "gap_p50_ms": rounded(gap.percentile(50)),
+            "gap_p99_ms": rounded(gap.percentile(99)),
+            "gap_max_ms": rounded(gap.max),
+            "dropped_frames": self.dropped,
+            "out_of_order": self.out_of_order,
+            "negative_latency": lat.below_zero,
+        }
+
+
+class SnapshotWriter:
+    """
+    Write periodic statistics snapshots.
+
+    csv_path gets one appended row per snapshot (a time series of the run);
+    json_path is atomically replaced with the latest snapshot.
+    """
+
+    def __init__(self, csv_path: str | None = None, json_path: str | None = None):
+        self.csv_path = csv_path
+        self.json_path = json_path
+        self._fieldnames: list[str] | None = None  # CSV columns, fixed by the first row
+
+    def write(self, row: dict) -> None:
+        if self.csv_path:
+            if self._fieldnames is None:
+                self._fieldnames = list(row)
+            new_file = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+            with open(self.csv_path, "a", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=self._fieldnames, extrasaction="ignore")
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(row)
+        if self.json_path:
+            # Write beside the target and rename, so readers never see a partial file.
+            tmp_path = f"{self.json_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(row, f, indent=2)
+            os.replace(tmp_path, self.json_path)
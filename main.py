@@ -4,6 +4,9 @@ Eagle Eye Networks OAuth 2.0 Demo
 Usage:
   python main.py login    — Run the full OAuth authorization flow
   python main.py cameras  — List cameras (requires prior login)
+  python main.py cameras --all — List every camera, following pagination
+  python main.py stream   — Print the RTSP live stream URL
+  python main.py stream --display — Show the live stream, renewing the token as it runs
   python main.py refresh  — Manually refresh the access token
 """
 import sys
@@ -34,16 +37,31 @@ def cmd_login():
     print("Exchanging authorization code for tokens...")
     tokens = auth.exchange_code_for_tokens(code)
     auth.save_tokens(tokens)
+    api.invalidate_base_url()  # the new login may belong to a different account
 
     print("\nLogin successful!")
     print(f"  Access token expires in: {tokens.get('expires_in', '?')}s")
     print(f"  Token type: {tokens.get('token_type', '?')}")
 
 
+def _format_camera(cam: dict) -> str:
+    return f"  [{cam.get('id', '?')}] {cam.get('name', 'Unnamed')} — {cam.get('status', {}).get('connectionStatus', '?')}"
+
+
 def cmd_cameras():
-    """Fetch and display a list of cameras."""
+    """Fetch and display a list of cameras. Pass --all to page through every camera."""
     print("Fetching cameras...")
     try:
+        if "--all" in sys.argv[2:]:
+            count = 0
+            for cam in api.iter_pages("/cameras", params={"pageSize": 100}, prefetch=True):
+                if count == 0:
+                    print()
+                count += 1
+                print(_format_camera(cam))
+            print(f"\nFound {count} camera(s)." if count else "No cameras found.")
+            return
+
         result = api.get("/cameras", params={"pageSize": 10})
         cameras = result.get("results", [])
         if not cameras:
@@ -51,19 +69,23 @@ def cmd_cameras():
             return
         print(f"\nFound {len(cameras)} camera(s):\n")
         for cam in cameras:
-            print(f"  [{cam.get('id', '?')}] {cam.get('name', 'Unnamed')} — {cam.get('status', {}).get('connectionStatus', '?')}")
+            print(_format_camera(cam))
     except Exception as e:
         print(f"Error: {e}")
 
 
 def cmd_stream():
-    """Print the RTSP live stream URL for the configured camera."""
+    """Print the RTSP live stream URL for the configured camera. Pass --display to watch it."""
     import config as cfg
     camera_id = cfg.CAMERA_ID
     if not camera_id:
         print("ERROR: EEN_CAMERA_ID must be set in your .env file.")
         sys.exit(1)
 
+    if "--display" in sys.argv[2:]:
+        _display_stream(camera_id)
+        return
+
     try:
         url = api.get_live_stream()
         print(f"\nLive stream URL for camera {camera_id}:\n{url}\n")
@@ -73,6 +95,25 @@ def cmd_stream():
         print(f"Error: {e}")
 
 
+def _display_stream(camera_id: str):
+    """Show the live stream until 'q' is pressed, re-keying it whenever the token is refreshed."""
+    import cv2
+    import frames_gst
+
+    auth.start_background_refresh()
+    source = frames_gst.ResilientFrameSource(lambda: api.get_live_stream(camera_id))
+    frames = iter(source)
+    print("Press 'q' in the window to quit.")
+    try:
+        for frame in frames:
+            cv2.imshow(f"EEN Live Stream — {camera_id}", frame)
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                break
+    finally:
+        frames.close()  # drops the token subscription
+        cv2.destroyAllWindows()
+
+
 def cmd_refresh():
     """Manually refresh the access token using the stored refresh token."""
     tokens = auth.load_tokens()
@@ -2,43 +2,268 @@
 Measures true camera-to-receipt latency using RTCP Sender Report NTP timestamps.
 Run from WSL2 with the venv active:
     python measure_latency.py
+    python measure_latency.py --frames 0 --duration 86400 --snapshot-every 60 --csv soak.csv --json soak.json
+    python measure_latency.py --survey                     # every camera in the account
+    python measure_latency.py --survey CAM1 CAM2 --frames 100 --concurrency 16
+    python measure_latency.py --survey --packets --concurrency 64   # no decoding
+
+Statistics are kept in constant memory (see latency_stats.py), so long soak
+runs do not grow; --csv appends one row per snapshot interval and --json holds
+the running totals.
+
+Survey mode measures many cameras concurrently and prints a table ranked from
+slowest to fastest, with time-to-first-frame and time-to-first-RTCP-SR.
 """
+import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import api
+import auth
 import frames_gst
 import cv2
 
+from latency_stats import LatencyStats, SnapshotWriter
+
 SAMPLE_FRAMES = 10
 
-print("Fetching RTSP URL...")
-rtsp_url = api.get_live_stream()
-print("Stream ready. Waiting for RTCP Sender Report (NTP timestamps)...\n")
 
-latencies = []
-last_frame = None
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure camera-to-receipt latency from RTCP SR NTP timestamps.")
+    parser.add_argument("--frames", type=int, default=SAMPLE_FRAMES,
+                        help=f"stop after this many measured frames (0 = no limit, default {SAMPLE_FRAMES})")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--snapshot-every", type=float, default=None, metavar="SECONDS",
+                        help="print and write a statistics snapshot at this interval")
+    parser.add_argument("--csv", default=None,
+                        help="append per-interval snapshots to this CSV file (one row per run "
+                             "without --snapshot-every)")
+    parser.add_argument("--json", default=None, help="keep the latest cumulative snapshot in this JSON file")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="nominal frame rate for dropped-frame detection (default: inferred)")
+    parser.add_argument("--packets", action="store_true",
+                        help="read NTP timestamps from RTP packets without decoding (much lower CPU; "
+                             "latency excludes decode time and no snapshot is saved)")
+    survey = parser.add_argument_group("survey mode")
+    survey.add_argument("--survey", nargs="*", default=None, metavar="CAMERA_ID",
+                        help="measure these cameras concurrently (no IDs = every camera in the account)")
+    survey.add_argument("--concurrency", type=int, default=8, help="streams measured at once (default 8)")
+    survey.add_argument("--timeout", type=float, default=30.0,
+                        help="seconds to wait for frames / an RTCP SR per camera (default 30)")
+    return parser.parse_args()
+
+
+def _print_summary(title: str, snap: dict) -> None:
+    print(f"\n--- {title} ({snap['frames']} frames) ---")
+    print(f"  Min latency : {snap['latency_min_ms']:.1f} ms")
+    print(f"  Max latency : {snap['latency_max_ms']:.1f} ms")
+    print(f"  Avg latency : {snap['latency_mean_ms']:.1f} ms")
+    print(f"  p50/p95/p99 : {snap['latency_p50_ms']:.1f} / {snap['latency_p95_ms']:.1f} / {snap['latency_p99_ms']:.1f} ms")
+    print(f"  Jitter      : {snap['jitter_ms']:.1f} ms")
+    if snap["gap_max_ms"] is not None:
+        print(f"  Frame gaps  : p50 {snap['gap_p50_ms']:.1f} ms, p99 {snap['gap_p99_ms']:.1f} ms, max {snap['gap_max_ms']:.1f} ms")
+    print(f"  Dropped     : {snap['dropped_frames']} frame(s)")
+
+
+def _iter_samples(
+    rtsp_url: str,
+    args: argparse.Namespace,
+    timeout: float | None = None,
+    clock: frames_gst.NtpClockModel | None = None,
+):
+    """
+    Yield (frame, capture_unix, received_at). With --packets the RTP stream is
+    probed without decoding and frame is always None.
+    """
+    if args.packets:
+        for capture_unix, received_at in frames_gst.iter_rtp_ntp(rtsp_url, timeout=timeout, clock=clock):
+            yield None, capture_unix, received_at
+        return
+    # Surveys only need the NTP timestamps; GRAY8 output skips most colour conversion.
+    options = frames_gst.PipelineOptions(format="GRAY8") if args.survey is not None else None
+    yield from frames_gst.iter_frames_ntp(rtsp_url, options=options, timeout=timeout, clock=clock)
+
+
+def _survey_camera(camera_id: str, rtsp_url: str, args: argparse.Namespace) -> dict:
+    """Measure one camera; returns a table row. Errors are reported in the row, not raised."""
+    row = {"camera_id": camera_id, "ttff_ms": None, "ttfsr_ms": None, "error": None}
+    stats = LatencyStats(expected_fps=args.fps)
+    clock = frames_gst.NtpClockModel()
+    started = time.monotonic()
+
+    try:
+        for _, capture_unix, received_at in _iter_samples(rtsp_url, args, timeout=args.timeout, clock=clock):
+            elapsed = time.monotonic() - started
+            if row["ttff_ms"] is None:
+                row["ttff_ms"] = round(elapsed * 1000, 1)
+            if capture_unix is None:
+                if elapsed > args.timeout:
+                    break
+                continue
+            if row["ttfsr_ms"] is None:
+                row["ttfsr_ms"] = round(elapsed * 1000, 1)
+            stats.add(capture_unix, received_at)
+            if args.frames and stats.latency_ms.count >= args.frames:
+                break
+            if args.duration is not None and elapsed >= args.duration:
+                break
+    except Exception as e:
+        row["error"] = str(e)
+
+    if row["error"] is None and stats.latency_ms.count == 0:
+        row["error"] = "no frames" if row["ttff_ms"] is None else "no RTCP SR"
+    snap = stats.snapshot()
+    for key in ("frames", "latency_p50_ms", "latency_p99_ms", "jitter_ms", "dropped_frames"):
+        row[key] = snap[key]
+    row["skew_ppm"] = clock.stats()["skew_ppm"] if clock.sr_count >= 2 else None
+    return row
+
+
+def _rank(rows: list[dict]) -> list[dict]:
+    """Slowest p50 first; cameras that could not be measured go last."""
+    ok = sorted((r for r in rows if r["error"] is None), key=lambda r: r["latency_p50_ms"], reverse=True)
+    return ok + [r for r in rows if r["error"] is not None]
+
+
+def _print_survey_table(rows: list[dict]) -> None:
+    def ms(value) -> str:
+        return f"{value:.0f}" if value is not None else "-"
+
+    def ppm(value) -> str:
+        return f"{value:.1f}" if value is not None else "-"
 
-for frame, capture_unix, received_at in frames_gst.iter_frames_ntp(rtsp_url):
-    if capture_unix is None:
-        print("  (waiting for RTCP SR...)")
-        continue
+    print(f"\n  {'#':>3}  {'camera':<12}{'name':<28}{'p50 ms':>8}{'p99 ms':>8}{'jitter':>8}"
+          f"{'TTFF ms':>9}{'TTFSR ms':>10}{'skew ppm':>10}{'frames':>8}")
+    for rank, r in enumerate(rows, 1):
+        line = (f"  {rank:>3}  {r['camera_id']:<12}{(r.get('name') or '')[:27]:<28}"
+                f"{ms(r['latency_p50_ms']):>8}{ms(r['latency_p99_ms']):>8}{ms(r['jitter_ms']):>8}"
+                f"{ms(r['ttff_ms']):>9}{ms(r['ttfsr_ms']):>10}{ppm(r['skew_ppm']):>10}{r['frames']:>8}")
+        if r["error"]:
+            line += f"  ({r['error']})"
+        print(line)
 
-    latency_ms = (received_at - capture_unix) * 1000
-    latencies.append(latency_ms)
-    last_frame = frame
-    print(f"  Frame {len(latencies):3d} | capture {capture_unix:.3f} | latency {latency_ms:.1f} ms")
 
-    if len(latencies) >= SAMPLE_FRAMES:
-        break
+def survey(args: argparse.Namespace) -> None:
+    """Measure latency on many cameras concurrently and print a ranked table."""
+    names: dict[str, str] = {}
+    if args.survey:
+        camera_ids = list(dict.fromkeys(args.survey))
+    else:
+        print("Listing cameras...")
+        for cam in api.iter_pages("/cameras", params={"pageSize": 100}, prefetch=True):
+            names[cam["id"]] = cam.get("name", "")
+        camera_ids = list(names)
+    if not camera_ids:
+        print("No cameras to survey.")
+        return
+
+    print(f"Resolving RTSP URLs for {len(camera_ids)} camera(s)...")
+    urls = api.get_live_streams(camera_ids)
+    rows = [
+        {"camera_id": cid, "ttff_ms": None, "ttfsr_ms": None, "frames": 0, "latency_p50_ms": None,
+         "latency_p99_ms": None, "jitter_ms": None, "dropped_frames": 0, "skew_ppm": None,
+         "error": "no RTSP URL"}
+        for cid in camera_ids if cid not in urls
+    ]
+
+    print(f"Measuring {len(urls)} stream(s), {args.concurrency} at a time...\n")
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="een-survey") as executor:
+        futures = [executor.submit(_survey_camera, cid, url, args) for cid, url in urls.items()]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            rows.append(row)
+            status = row["error"] or f"p50 {row['latency_p50_ms']:.0f} ms"
+            print(f"  [{done:>3}/{len(futures)}] {row['camera_id']}: {status}")
+
+    for row in rows:
+        row["name"] = names.get(row["camera_id"], "")
+    rows = _rank(rows)
+    _print_survey_table(rows)
+
+    if args.csv:
+        writer = SnapshotWriter(csv_path=args.csv)
+        for row in rows:
+            writer.write(row)
+
+
+def main() -> None:
+    args = _parse_args()
+    # Soak and survey runs can outlive an access token; renew it ahead of expiry.
+    auth.start_background_refresh()
+    if args.survey is not None:
+        survey(args)
+        return
+    periodic = args.snapshot_every is not None
+
+    print("Fetching RTSP URL...")
+    rtsp_url = api.get_live_stream()
+    print("Stream ready. Waiting for RTCP Sender Report (NTP timestamps)...\n")
+
+    total = LatencyStats(expected_fps=args.fps)
+    window = LatencyStats(expected_fps=args.fps)
+    window_writer = SnapshotWriter(csv_path=args.csv)    # one row per interval
+    total_writer = SnapshotWriter(json_path=args.json)   # running totals
+    clock = frames_gst.NtpClockModel()
+    last_frame = None
+    started = time.monotonic()
+    next_snapshot = started + args.snapshot_every if periodic else None
+
+    try:
+        for frame, capture_unix, received_at in _iter_samples(rtsp_url, args, clock=clock):
+            if capture_unix is None:
+                if total.latency_ms.count == 0:
+                    print("  (waiting for RTCP SR...)")
+                continue
+
+            latency_ms = total.add(capture_unix, received_at)
+            window.add(capture_unix, received_at)
+            last_frame = frame
+            if not periodic:
+                print(f"  Frame {total.latency_ms.count:3d} | capture {capture_unix:.3f} | latency {latency_ms:.1f} ms")
+
+            now = time.monotonic()
+            if periodic and now >= next_snapshot:
+                snap = {"timestamp": round(time.time(), 3), "elapsed_s": round(now - started, 1),
+                        **window.snapshot(), **clock.stats()}
+                print(f"  [{snap['elapsed_s']:>8.1f}s] frames {snap['frames']:5d} | "
+                      f"p50 {snap['latency_p50_ms']} ms | p99 {snap['latency_p99_ms']} ms | "
+                      f"jitter {snap['jitter_ms']} ms | dropped {snap['dropped_frames']}")
+                window_writer.write(snap)
+                total_writer.write({"timestamp": snap["timestamp"], "elapsed_s": snap["elapsed_s"],
+                                    **total.snapshot(), **clock.stats()})
+                window.reset()
+                next_snapshot = now + args.snapshot_every
+
+            if args.frames and total.latency_ms.count >= args.frames:
+                break
+            if args.duration is not None and now - started >= args.duration:
+                break
+    except KeyboardInterrupt:
+        print("\nInterrupted.")
+
+    if total.latency_ms.count == 0:
+        print("\nNo RTCP Sender Reports received — cannot compute latency.")
+        return
+
+    # Final totals: the JSON always ends with the whole run; without
+    # --snapshot-every the CSV gets a single row for the run.
+    final = {"timestamp": round(time.time(), 3), "elapsed_s": round(time.monotonic() - started, 1),
+             **total.snapshot(), **clock.stats()}
+    total_writer.write(final)
+    if not periodic:
+        window_writer.write(final)
 
-if not latencies:
-    print("\nNo RTCP Sender Reports received — cannot compute latency.")
-else:
     if last_frame is not None:
         cv2.imwrite("latency_snapshot.jpg", last_frame)
 
-    print(f"\n--- Summary ({len(latencies)} frames) ---")
-    print(f"  Min latency : {min(latencies):.1f} ms")
-    print(f"  Max latency : {max(latencies):.1f} ms")
-    print(f"  Avg latency : {sum(latencies)/len(latencies):.1f} ms")
+    _print_summary("Summary", total.snapshot())
+    if clock.sr_count >= 2:
+        c = clock.stats()
+        print(f"  Camera clock: skew {c['skew_ppm']:+.1f} ppm, drift {c['drift_ms']:+.1f} ms "
+              f"over {c['sr_count']} SRs, last SR correction {c['last_error_ms']:+.2f} ms")
     if last_frame is not None:
         print("  Snapshot    : latency_snapshot.jpg")
+
+
+if __name__ == "__main__":
+    main()
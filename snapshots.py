@@ -0,0 +1,121 @@
+"""
+Takes a JPEG snapshot of many cameras concurrently and reports how long each took.
+
+Each snapshot decodes only the camera's first keyframe (frames_gst.grab_jpeg),
+so a camera costs one short RTSP session and a single decode.
+
+    python snapshots.py                           # every camera in the account
+    python snapshots.py CAM1 CAM2 --out snaps --concurrency 32 --csv snapshots.csv
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import api
+import auth
+import frames_gst
+from latency_stats import SnapshotWriter
+
+
+def _snapshot_camera(camera_id: str, rtsp_url: str, args: argparse.Namespace) -> dict:
+    """Snapshot one camera; returns a report row. Errors are reported in the row, not raised."""
+    startup = frames_gst.StartupTiming()
+    row = {"camera_id": camera_id, "total_ms": None, "bytes": None, "path": None, "error": None}
+    started = time.monotonic()
+    try:
+        data = frames_gst.grab_jpeg(rtsp_url, quality=args.quality, timeout=args.timeout, startup=startup)
+        path = os.path.join(args.out, f"{camera_id}.jpg")
+        with open(path, "wb") as f:
+            f.write(data)
+        row.update(total_ms=round((time.monotonic() - started) * 1000, 1), bytes=len(data), path=path)
+    except Exception as e:
+        row["error"] = str(e)
+    for phase in ("play_done_ms", "first_rtp_ms", "first_keyframe_ms", "first_frame_ms"):
+        row[phase] = getattr(startup, phase)
+    return row
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[max(0, math.ceil(q / 100.0 * len(sorted_values)) - 1)]
+
+
+def _print_report(rows: list[dict]) -> None:
+    def ms(value) -> str:
+        return f"{value:.0f}" if value is not None else "-"
+
+    print(f"\n  {'camera':<12}{'name':<28}{'PLAY ms':>9}{'RTP ms':>8}{'key ms':>8}{'JPEG ms':>9}"
+          f"{'total ms':>10}{'KB':>7}")
+    for r in rows:
+        size = f"{r['bytes'] / 1024:.0f}" if r["bytes"] else "-"
+        line = (f"  {r['camera_id']:<12}{(r.get('name') or '')[:27]:<28}{ms(r['play_done_ms']):>9}"
+                f"{ms(r['first_rtp_ms']):>8}{ms(r['first_keyframe_ms']):>8}{ms(r['first_frame_ms']):>9}"
+                f"{ms(r['total_ms']):>10}{size:>7}")
+        if r["error"]:
+            line += f"  ({r['error']})"
+        print(line)
+
+    totals = sorted(r["total_ms"] for r in rows if r["total_ms"] is not None)
+    if totals:
+        print(f"\n  {len(totals)}/{len(rows)} snapshots: p50 {_percentile(totals, 50):.0f} ms, "
+              f"p95 {_percentile(totals, 95):.0f} ms, max {totals[-1]:.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("camera_ids", nargs="*", metavar="CAMERA_ID", help="default: every camera in the account")
+    parser.add_argument("--out", default="snapshots", help="output directory (default ./snapshots)")
+    parser.add_argument("--concurrency", type=int, default=16, help="snapshots taken at once (default 16)")
+    parser.add_argument("--timeout", type=float, default=15.0, help="seconds to wait for a keyframe (default 15)")
+    parser.add_argument("--quality", type=int, default=85, help="JPEG quality 0-100 (default 85)")
+    parser.add_argument("--stream-type", default="main", choices=("main", "preview"))
+    parser.add_argument("--csv", default=None, help="write the report to this CSV file")
+    args = parser.parse_args()
+    auth.start_background_refresh()
+
+    names: dict[str, str] = {}
+    if args.camera_ids:
+        camera_ids = list(dict.fromkeys(args.camera_ids))
+    else:
+        print("Listing cameras...")
+        for cam in api.iter_pages("/cameras", params={"pageSize": 100}, prefetch=True):
+            names[cam["id"]] = cam.get("name", "")
+        camera_ids = list(names)
+    if not camera_ids:
+        print("No cameras to snapshot.")
+        return
+
+    os.makedirs(args.out, exist_ok=True)
+    urls = api.get_live_streams(camera_ids, stream_type=args.stream_type)
+    rows = [
+        {"camera_id": cid, "total_ms": None, "bytes": None, "path": None, "error": "no RTSP URL",
+         "play_done_ms": None, "first_rtp_ms": None, "first_keyframe_ms": None, "first_frame_ms": None}
+        for cid in camera_ids if cid not in urls
+    ]
+
+    print(f"Snapshotting {len(urls)} camera(s), {args.concurrency} at a time...\n")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="een-snapshot") as executor:
+        futures = [executor.submit(_snapshot_camera, cid, url, args) for cid, url in urls.items()]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            rows.append(row)
+            status = row["error"] or f"{row['total_ms']:.0f} ms -> {row['path']}"
+            print(f"  [{done:>3}/{len(futures)}] {row['camera_id']}: {status}")
+    elapsed = time.monotonic() - started
+
+    for row in rows:
+        row["name"] = names.get(row["camera_id"], "")
+    rows.sort(key=lambda r: (r["total_ms"] is None, -(r["total_ms"] or 0)))
+    _print_report(rows)
+    print(f"  Wall time: {elapsed:.1f} s")
+
+    if args.csv:
+        writer = SnapshotWriter(csv_path=args.csv)
+        for row in rows:
+            writer.write(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import auth  # noqa: E402
+import config  # noqa: E402
+
+EXPIRES_IN = 4
+
+
+def test_refresh_reaches_subscribers_before_expiry(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "TOKEN_FILE", str(tmp_path / "tokens.json"))
+    monkeypatch.setattr(auth, "_cached_tokens", None)
+    monkeypatch.setattr(auth, "_cached_mtime", None)
+    obtained_at = time.time()
+    auth.save_tokens({"access_token": "old", "refresh_token": "r1",
+                      "expires_in": EXPIRES_IN, "obtained_at": obtained_at})
+
+    def fake_refresh(refresh_token):
+        assert refresh_token == "r1"
+        return {"access_token": "new", "refresh_token": "r2",
+                "expires_in": 3600, "obtained_at": time.time()}
+
+    monkeypatch.setattr(auth, "refresh_access_token", fake_refresh)
+
+    received = []
+    delivered = threading.Event()
+
+    def on_refresh(access_token):
+        received.append((access_token, time.time()))
+        delivered.set()
+
+    auth.subscribe(on_refresh)
+    refresher = auth.TokenRefresher(lead_seconds=600, retry_seconds=0.1)
+    refresher.start()
+    try:
+        assert delivered.wait(EXPIRES_IN + 1)
+    finally:
+        refresher.stop()
+        refresher.join(5)
+        auth.unsubscribe(on_refresh)
+
+    (token, at), = received
+    assert token == "new"
+    assert at < obtained_at + EXPIRES_IN
+    assert auth.get_valid_access_token() == "new"